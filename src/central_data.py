@@ -26,7 +26,7 @@ class CentralData:
         :source: source of command  default: cgd (ChessGameDisplay)
         """
         new_index = move_index
-        if move_index >= self.cgd.move_index:
+        if move_index != self.move_index:   # forward or back
             new_index = self.ccs.update_board_state_for_goto_move_index(move_index)
         if new_index >= 0:
             self.move_index = move_index
@@ -0,0 +1,194 @@
+#chess_attack_tables.py 18Oct2026  crs, Author
+"""
+Precomputed per-square attack tables
+Indexed by mailbox index (chess_mailbox.py) so lookups go
+straight against Chessboard.mb_setting.
+    knight_sqs[index]   knight jump squares
+    king_sqs[index]     king neighbour squares
+    pawn_from_sqs[color][index]  squares from which a pawn
+                        of color attacks index
+    rook_rays[index]    rank/file rays, each a list of squares
+                        moving away from index
+    bishop_rays[index]  diagonal rays
+Attack detection is then a reverse lookup from the target
+square: a few table probes instead of testing every opponent
+piece.  Tables depend only on board size and are built once
+per size.
+"""
+from chess_mailbox import ChessMailbox
+
+class ChessAttackTables:
+    knight_dirs = ChessMailbox.piece_type_dirs["n"]
+    king_dirs = ChessMailbox.piece_type_dirs["k"]
+    rook_dirs = ChessMailbox.piece_type_dirs["r"]
+    bishop_dirs = ChessMailbox.piece_type_dirs["b"]
+    pawn_from_dirs = {                  # reverse of pawn capture
+        "white" : [(-1,-1), (1,-1)],    # white pawn below target
+        "black" : [(-1,1), (1,1)],
+    }
+
+    tables_by_size = {}     # ChessAttackTables by (nsqx,nsqy)
+
+    @classmethod
+    def get_tables(cls, nsqx=8, nsqy=8):
+        """ Get shared tables for board size
+        :nsqx: number of files default: 8
+        :nsqy: number of ranks default: 8
+        :returns: ChessAttackTables instance
+        """
+        size = (nsqx, nsqy)
+        if size not in cls.tables_by_size:
+            cls.tables_by_size[size] = ChessAttackTables(nsqx, nsqy)
+        return cls.tables_by_size[size]
+
+    def __init__(self, nsqx=8, nsqy=8):
+        """ Build tables
+        :nsqx: number of files
+        :nsqy: number of ranks
+        """
+        self.nsqx = nsqx
+        self.nsqy = nsqy
+        self.mailbox = mailbox = ChessMailbox.get_mailbox(nsqx, nsqy)
+        size = mailbox.size
+        self.knight_sqs = [None]*size
+        self.king_sqs = [None]*size
+        self.pawn_from_sqs = {"white" : [None]*size, "black" : [None]*size}
+        self.rook_rays = [None]*size
+        self.bishop_rays = [None]*size
+        for index in mailbox.on_board_indexes:
+            file, rank = mailbox.index_file_rank[index]
+            self.knight_sqs[index] = self.step_sqs(file, rank,
+                                                   self.knight_dirs)
+            self.king_sqs[index] = self.step_sqs(file, rank,
+                                                 self.king_dirs)
+            for color, dirs in self.pawn_from_dirs.items():
+                self.pawn_from_sqs[color][index] = self.step_sqs(
+                                                    file, rank, dirs)
+            self.rook_rays[index] = self.rays(file, rank, self.rook_dirs)
+            self.bishop_rays[index] = self.rays(file, rank,
+                                                self.bishop_dirs)
+
+    def __deepcopy__(self, memo):
+        """ Tables are never changed so are shared by copies
+        """
+        return self
+
+    def on_board(self, file, rank):
+        """ Check if on board
+        :file: file int 1-nsqx
+        :rank: rank int 1-nsqy
+        """
+        return 1 <= file <= self.nsqx and 1 <= rank <= self.nsqy
+
+    def step_sqs(self, file, rank, dirs):
+        """ One step squares
+        :file,rank: from square
+        :dirs: list of (x_inc,y_inc)
+        :returns: list of mailbox indexes on board
+        """
+        sqs = []
+        for dx, dy in dirs:
+            if self.on_board(file+dx, rank+dy):
+                sqs.append(self.mailbox.file_rank_to_index(file+dx,
+                                                           rank+dy))
+        return sqs
+
+    def rays(self, file, rank, dirs):
+        """ Ray squares, nearest first, to the board edge
+        :file,rank: from square
+        :dirs: list of (x_inc,y_inc)
+        :returns: list of non-empty rays, each a list of mailbox indexes
+        """
+        rays = []
+        for dx, dy in dirs:
+            ray = []
+            f, r = file+dx, rank+dy
+            while self.on_board(f, r):
+                ray.append(self.mailbox.file_rank_to_index(f, r))
+                f += dx
+                r += dy
+            if ray:
+                rays.append(ray)
+        return rays
+
+    def is_attacked(self, mb_setting, index, by_white):
+        """ Check if square is attacked by a side
+        :mb_setting: board contents by mailbox index
+        :index: target square's mailbox index
+        :by_white: True - white attackers, else black
+        :returns: True if attacked
+        """
+        if by_white:
+            knight, king, pawn, rook, bishop, queen = "NKPRBQ"
+            pawn_from_sqs = self.pawn_from_sqs["white"][index]
+        else:
+            knight, king, pawn, rook, bishop, queen = "nkprbq"
+            pawn_from_sqs = self.pawn_from_sqs["black"][index]
+        for i in self.knight_sqs[index]:
+            if mb_setting[i] == knight:
+                return True
+        for i in pawn_from_sqs:
+            if mb_setting[i] == pawn:
+                return True
+        for i in self.king_sqs[index]:
+            if mb_setting[i] == king:
+                return True
+        for ray in self.rook_rays[index]:
+            for i in ray:
+                piece = mb_setting[i]
+                if piece is not None:
+                    if piece == rook or piece == queen:
+                        return True
+                    break   # blocked
+        for ray in self.bishop_rays[index]:
+            for i in ray:
+                piece = mb_setting[i]
+                if piece is not None:
+                    if piece == bishop or piece == queen:
+                        return True
+                    break   # blocked
+        return False
+
+    def get_from_indexes(self, mb_setting, index, piece):
+        """ Find squares from which a piece, of piece's type and
+        color, reaches the target square in one move:
+        the reverse of its move.  Pawns and castling are not
+        included, their moves depend on more than the square.
+        :mb_setting: board contents by mailbox index
+        :index: target square's mailbox index
+        :piece: non-pawn piece e.g. N, q
+        :returns: list of mailbox indexes holding piece
+        """
+        piece_type = piece.lower()
+        if piece_type == 'n':
+            return [i for i in self.knight_sqs[index] if mb_setting[i] == piece]
+
+        if piece_type == 'k':
+            return [i for i in self.king_sqs[index] if mb_setting[i] == piece]
+
+        if piece_type == 'r':
+            rays = self.rook_rays[index]
+        elif piece_type == 'b':
+            rays = self.bishop_rays[index]
+        else:
+            rays = self.rook_rays[index] + self.bishop_rays[index]
+        from_indexes = []
+        for ray in rays:
+            for i in ray:
+                ray_piece = mb_setting[i]
+                if ray_piece is not None:
+                    if ray_piece == piece:
+                        from_indexes.append(i)
+                    break   # blocked
+        return from_indexes
+
+
+if __name__ == "__main__":
+    tables = ChessAttackTables.get_tables()
+    mailbox = tables.mailbox
+    for sq in ("a1", "e4", "h8"):
+        index = mailbox.sq_index[sq]
+        print(f"{sq}: knight:{[mailbox.index_sq[i] for i in tables.knight_sqs[index]]}"
+              f" white pawn from:{[mailbox.index_sq[i] for i in tables.pawn_from_sqs['white'][index]]}"
+              f" rook rays:{len(tables.rook_rays[index])}"
+              f" bishop rays:{len(tables.bishop_rays[index])}")
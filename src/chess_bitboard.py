@@ -0,0 +1,394 @@
+#chess_bitboard.py 18Oct2026  crs, Author
+"""
+Bitboard move generation - engine="bitboard" for Chessboard
+Each piece (e.g. K, p) has a 64 bit integer with a bit set
+for every square it occupies.  Square index: a1=0, b1=1, ... h8=63
+Produces the same results as the ChessPieceMovement
+get_move_sqs_base, is_attacked and castle_info functions.
+    Knight, king and pawn attacks are precomputed masks.
+    Sliding attacks use classical ray lookup: the ray from the
+    square in each direction, cut at the first blocker.
+Standard 8x8 board only.
+"""
+from chess_error import ChessError
+from chess_piece_movement import CastleInfo
+
+NSQ = 8
+SQ_NAMES = [chr(ord('a')+i%NSQ) + chr(ord('1')+i//NSQ)
+            for i in range(NSQ*NSQ)]
+SQ_INDEX = {sq: i for i, sq in enumerate(SQ_NAMES)}
+
+def _build_step_masks(dirs):
+    """ Build one step attack mask for each square
+    :dirs: list of (file change, rank change)
+    :returns: list, by square index, of mask
+    """
+    masks = []
+    for i in range(NSQ*NSQ):
+        file, rank = i%NSQ, i//NSQ
+        mask = 0
+        for dx, dy in dirs:
+            f, r = file+dx, rank+dy
+            if 0 <= f < NSQ and 0 <= r < NSQ:
+                mask |= 1 << (r*NSQ + f)
+        masks.append(mask)
+    return masks
+
+def _build_rays(dx, dy):
+    """ Build ray, excluding the square, for each square
+    :dx,dy: direction
+    :returns: list, by square index, of ray mask
+    """
+    rays = []
+    for i in range(NSQ*NSQ):
+        f, r = i%NSQ + dx, i//NSQ + dy
+        mask = 0
+        while 0 <= f < NSQ and 0 <= r < NSQ:
+            mask |= 1 << (r*NSQ + f)
+            f += dx
+            r += dy
+        rays.append(mask)
+    return rays
+
+KNIGHT_ATTACKS = _build_step_masks([(1,2), (2,1), (2,-1), (1,-2),
+                                    (-1,-2), (-2,-1), (-2,1), (-1,2)])
+KING_ATTACKS = _build_step_masks([(0,1), (1,1), (1,0), (1,-1),
+                                  (0,-1), (-1,-1), (-1,0), (-1,1)])
+PAWN_ATTACKS = {                # squares a pawn of this color attacks
+    "white" : _build_step_masks([(-1,1), (1,1)]),
+    "black" : _build_step_masks([(-1,-1), (1,-1)]),
+    }
+# Rays in which the first blocker is the lowest set bit
+RAYS_UP = {"r" : [_build_rays(0,1), _build_rays(1,0)],
+           "b" : [_build_rays(1,1), _build_rays(-1,1)]}
+# Rays in which the first blocker is the highest set bit
+RAYS_DOWN = {"r" : [_build_rays(0,-1), _build_rays(-1,0)],
+             "b" : [_build_rays(-1,-1), _build_rays(1,-1)]}
+
+# Castling: (king orig, king dest, rook orig, rook dest) by to_move, kingside
+CASTLE_SQS = {
+    ("white", True) : ("e1", "g1", "h1", "f1"),
+    ("white", False) : ("e1", "c1", "a1", "d1"),
+    ("black", True) : ("e8", "g8", "h8", "f8"),
+    ("black", False) : ("e8", "c8", "a8", "d8"),
+    }
+
+def sq_bits(sqs):
+    """ Make mask from squares
+    :sqs: iterable of squares
+    :returns: mask
+    """
+    mask = 0
+    for sq in sqs:
+        mask |= 1 << SQ_INDEX[sq]
+    return mask
+
+def _castle_masks(king_sq, king_dest, rook_sq, rook_dest):
+    """ Masks used in castle check
+    :returns: (must be empty mask, king travel squares)
+    """
+    k, r = SQ_INDEX[king_sq], SQ_INDEX[rook_sq]
+    lo, hi = min(k, r), max(k, r)
+    between = [SQ_NAMES[i] for i in range(lo+1, hi)]
+    kd = SQ_INDEX[king_dest]
+    step = 1 if kd > k else -1
+    king_trav = [SQ_NAMES[i] for i in range(k, kd+step, step)]
+    empty_mask = sq_bits(between + [king_dest, rook_dest])
+    return empty_mask, king_trav
+
+CASTLE_MASKS = {key: _castle_masks(*sqs) for key, sqs in CASTLE_SQS.items()}
+
+def bit_sqs(mask):
+    """ Squares of mask's set bits
+    :mask: bit mask
+    :returns: list of squares, low to high
+    """
+    sqs = []
+    while mask:
+        low = mask & -mask
+        sqs.append(SQ_NAMES[low.bit_length()-1])
+        mask ^= low
+    return sqs
+
+
+class ChessBitboard:
+    WHITE_PIECES = "KQRBNP"
+    BLACK_PIECES = "kqrbnp"
+
+    def __init__(self, board):
+        """ Setup bitboards for board
+        :board: Chessboard, must be 8x8
+        """
+        if board.nsqx != NSQ or board.nsqy != NSQ:
+            raise ChessError(f"bitboard engine supports only"
+                             f" {NSQ}x{NSQ} boards")
+        self.board = board
+        self.clear()
+
+    def clear(self):
+        """ Empty all bitboards
+        """
+        self.pieces_bb = {piece: 0 for piece in
+                          self.WHITE_PIECES+self.BLACK_PIECES}
+        self.white_bb = 0
+        self.black_bb = 0
+
+    def copy(self, board):
+        """ Copy bitboards for a board copy
+        :board: Chessboard copy, with our contents
+        :returns: ChessBitboard
+        """
+        bb_new = ChessBitboard.__new__(ChessBitboard)
+        bb_new.board = board
+        bb_new.pieces_bb = self.pieces_bb.copy()
+        bb_new.white_bb = self.white_bb
+        bb_new.black_bb = self.black_bb
+        return bb_new
+
+    def sync(self, board_setting):
+        """ Rebuild from board contents
+        :board_setting: dictionary, by sq, of piece/None
+        """
+        self.clear()
+        for sq, piece in board_setting.items():
+            if piece is not None and sq in SQ_INDEX:
+                self.set_sq(sq, None, piece)
+
+    def set_sq(self, sq, prev_piece, piece):
+        """ Update for change in square contents
+        :sq: square
+        :prev_piece: previous contents None - empty
+        :piece: new contents None - empty
+        """
+        index = SQ_INDEX.get(sq)
+        if index is None:
+            return
+
+        bit = 1 << index
+        if prev_piece is not None:
+            self.pieces_bb[prev_piece] &= ~bit
+            if prev_piece.isupper():
+                self.white_bb &= ~bit
+            else:
+                self.black_bb &= ~bit
+        if piece is not None:
+            self.pieces_bb[piece] |= bit
+            if piece.isupper():
+                self.white_bb |= bit
+            else:
+                self.black_bb |= bit
+
+    def slider_attacks(self, slide_type, index, occupied):
+        """ Squares attacked by rook or bishop movement
+        :slide_type: "r" or "b"
+        :index: square index
+        :occupied: mask of occupied squares
+        :returns: attack mask, including the first blocker
+                    in each direction
+        """
+        attacks = 0
+        for rays in RAYS_UP[slide_type]:
+            ray = rays[index]
+            blockers = ray & occupied
+            if blockers:
+                first = (blockers & -blockers).bit_length() - 1
+                ray ^= rays[first]
+            attacks |= ray
+        for rays in RAYS_DOWN[slide_type]:
+            ray = rays[index]
+            blockers = ray & occupied
+            if blockers:
+                first = blockers.bit_length() - 1
+                ray ^= rays[first]
+            attacks |= ray
+        return attacks
+
+    def piece_attacks(self, piece, index):
+        """ Squares attacked by piece from square
+        :piece: piece
+        :index: square index
+        :returns: attack mask (may include our own pieces)
+        """
+        piece_type = piece.lower()
+        if piece_type == 'n':
+            return KNIGHT_ATTACKS[index]
+        if piece_type == 'k':
+            return KING_ATTACKS[index]
+        if piece_type == 'p':
+            return PAWN_ATTACKS["white" if piece == 'P' else "black"][index]
+        occupied = self.white_bb | self.black_bb
+        if piece_type == 'q':
+            return (self.slider_attacks("r", index, occupied)
+                    | self.slider_attacks("b", index, occupied))
+        return self.slider_attacks(piece_type, index, occupied)
+
+    def get_move_sqs_base(self, piece, orig_sq):
+        """ Get squares to which we can move without leaving
+        the board nor hitting a square of our own color,
+        including castling.  No checking for king in check.
+        Same results as ChessPieceMovement.get_move_sqs_base
+        :piece: our piece
+        :orig_sq: original square
+        :returns: dictionary, by dest sq, of pre-move contents
+        """
+        index = SQ_INDEX[orig_sq]
+        is_white = piece.isupper()
+        ours = self.white_bb if is_white else self.black_bb
+        theirs = self.black_bb if is_white else self.white_bb
+        board_setting = self.board.board_setting
+        piece_type = piece.lower()
+        sqs_d = {}
+        if piece_type == 'p':
+            occupied = ours | theirs
+            targets = 0
+            if is_white:
+                step = (1 << (index+8)) if index < 56 else 0
+                if step and not step & occupied:
+                    targets |= step
+                    if 8 <= index < 16 and not (step << 8) & occupied:
+                        targets |= step << 8
+            else:
+                step = (1 << (index-8)) if index >= 8 else 0
+                if step and not step & occupied:
+                    targets |= step
+                    if 48 <= index < 56 and not (step >> 8) & occupied:
+                        targets |= step >> 8
+            attacks = PAWN_ATTACKS["white" if is_white else "black"][index]
+            targets |= attacks & theirs
+            ep_sq = self.board.poss_en_passant
+            if ep_sq is not None and ep_sq in SQ_INDEX:
+                if attacks & (1 << SQ_INDEX[ep_sq]):
+                    targets |= 1 << SQ_INDEX[ep_sq]
+        else:
+            targets = self.piece_attacks(piece, index) & ~ours
+        for sq in bit_sqs(targets):
+            sqs_d[sq] = board_setting.get(sq)
+        if piece_type == 'p':
+            ep_sq = self.board.poss_en_passant
+            if ep_sq in sqs_d:
+                sqs_d[ep_sq] = None     # as ChessPieceMovement
+
+        if piece_type == 'k' or piece_type == 'r':
+            for kingside in (True, False):
+                castle_info = self.castle_info(piece, orig_sq,
+                                kingside=kingside, ck_for_check=True)
+                if castle_info.can_castle:
+                    dest_sq = castle_info.dest_sq
+                    sqs_d[dest_sq] = board_setting.get(dest_sq)
+        return sqs_d
+
+    def attackers_mask(self, index, by_white):
+        """ Pieces of a color which attack a square
+        :index: square index
+        :by_white: True - white attackers, else black
+        :returns: mask of attacking pieces' squares
+        """
+        pbb = self.pieces_bb
+        if by_white:
+            knights, king, pawns = pbb['N'], pbb['K'], pbb['P']
+            rooks = pbb['R'] | pbb['Q']
+            bishops = pbb['B'] | pbb['Q']
+            pawn_from = PAWN_ATTACKS["black"][index]  # reverse direction
+        else:
+            knights, king, pawns = pbb['n'], pbb['k'], pbb['p']
+            rooks = pbb['r'] | pbb['q']
+            bishops = pbb['b'] | pbb['q']
+            pawn_from = PAWN_ATTACKS["white"][index]
+        occupied = self.white_bb | self.black_bb
+        attackers = ((KNIGHT_ATTACKS[index] & knights)
+                     | (KING_ATTACKS[index] & king)
+                     | (pawn_from & pawns))
+        if rooks:
+            attackers |= self.slider_attacks("r", index, occupied) & rooks
+        if bishops:
+            attackers |= self.slider_attacks("b", index, occupied) & bishops
+        return attackers
+
+    def is_attacked(self, piece, sq):
+        """ Check if piece is attacked (by an opponent)
+        :piece: our piece Upper case for white
+        :sq: piece's square
+        :returns: True if attacked
+        """
+        return self.attackers_mask(SQ_INDEX[sq],
+                                   by_white=not piece.isupper()) != 0
+
+    def castle_info(self, piece, orig_sq, kingside=True,
+                    ck_for_check=False):
+        """ Check if this piece (type and color)
+        can castle on side requested (kinside)
+        Same results as ChessPieceMovement.castle_info
+        :piece: kKrR, king(black,white), rook(black,white)
+        :orig_sq: piece's original square
+        :kingside: True=kingside, else queenside
+        :ck_for_check: True - check for king:
+                in,through,ending in check
+        :returns: castling info (CastleInfo)
+        """
+        no_castle = CastleInfo(can_castle=False)
+        piece_type = piece.lower()
+        if piece_type != 'k' and piece_type != 'r':
+            return no_castle
+
+        to_move = "white" if piece.isupper() else "black"
+        if not self.board.castle_opportunity(to_move=to_move,
+                                             kingside=kingside):
+            return no_castle
+
+        king_sq, king_dest, rook_sq, rook_dest = CASTLE_SQS[(to_move, kingside)]
+        if piece_type == 'k':
+            if orig_sq != king_sq:
+                return no_castle
+            dest_sq = king_dest
+        else:
+            if orig_sq != rook_sq:
+                return no_castle
+            dest_sq = rook_dest
+        king = 'K' if to_move == "white" else 'k'
+        rook = 'R' if to_move == "white" else 'r'
+        if not self.pieces_bb[king] & (1 << SQ_INDEX[king_sq]):
+            return no_castle
+
+        if not self.pieces_bb[rook] & (1 << SQ_INDEX[rook_sq]):
+            return no_castle
+
+        empty_mask, king_trav = CASTLE_MASKS[(to_move, kingside)]
+        if empty_mask & (self.white_bb | self.black_bb):
+            return no_castle
+
+        if ck_for_check:
+            for sq in king_trav:
+                if self.is_attacked(king, sq):
+                    return no_castle
+
+        return CastleInfo(True, piece, dest_sq, king_sq, rook_sq)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from graphics_braille.select_trace import SlTrace
+    from chessboard import Chessboard
+
+    SlTrace.clearFlags()
+    """ Rough generator speed: count legal moves (nodes)
+    for all pieces of side to move, per engine
+    """
+    fens = [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        ]
+    engines = sys.argv[1:] if len(sys.argv) > 1 else Chessboard.ENGINES
+    nrep = 5
+    for engine in engines:
+        nodes = 0
+        time_start = time.time()
+        for fen in fens:
+            cb = Chessboard(pieces="FEN:"+fen, engine=engine)
+            for _ in range(nrep):
+                for ps in cb.get_side_pieces():
+                    nodes += len(cb.get_move_to_sqs(ps[0], ps[1:]))
+        dur = time.time() - time_start
+        SlTrace.lg(f"{engine:8} nodes: {nodes} {dur:.3f} sec"
+                   f" {nodes/dur:.0f} nodes/sec")
@@ -101,6 +101,10 @@ class ChessFEN:
             return self.err
         
         castling, fs = match_fen_castling.groups()
+        self.can_castle_white_kingside = False  # Only those listed
+        self.can_castle_white_queenside = False
+        self.can_castle_black_kingside = False
+        self.can_castle_black_queenside = False
         for ch in castling:
             if ch == 'K':
                 self.can_castle_white_kingside = True
@@ -124,7 +128,7 @@ class ChessFEN:
         grps = match_fen_en_passant.groups()
         
         ep_stuff, en_passant_none, en_passant_sq, fs = grps
-        if en_passant_none == "_":
+        if en_passant_none == "-":
             self.poss_en_passant = None
         else:
             self.poss_en_passant = en_passant_sq
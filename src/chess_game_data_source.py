@@ -1,7 +1,7 @@
 # chess_game_data_source.py 16Apr2025  crs, from wxPython in Action
 import wx
 
-import pgn
+from pgn_index import PgnIndex
 
 from graphics_braille.select_trace import SlTrace
 
@@ -15,6 +15,8 @@ class ChessGameDataSource:
     
     def __init__(self, game_file_name, columns=None):
         """ Setup file game access
+        Rows come from the file's index (PgnIndex) so only games
+        shown are read
         :game_file_name: game file path
         :columns: data displayed
             default use given
@@ -22,53 +24,61 @@ class ChessGameDataSource:
             rest are attributes in pgn
             
         """
+        if columns is not None:
+            self.columns = columns
+        self.games = {}         # PGNGame by index, for cached rows
         try:
-            game_file = open(game_file_name, 'r')
+            self.pgn_index = PgnIndex.get_index(game_file_name)
             
         except IOError:
             wx.LogError("Cannot open file '%s'." % game_file_name)
+            self.pgn_index = []
             return
         
-        pgn_text = game_file.read()
-
-        pgn_games = pgn.loads(pgn_text) # Returns a list of PGNGame
-        self.game_selections = []
-        self.games_by_selection = {}     # Unique selections ???
-        
-        max_g = 10000
-        
-        for game_index, pgn_game in enumerate(pgn_games):
-            n = game_index + 1
-            self.game_selections.append((n, pgn_game))
-
-        
     def GetColumnHeaders(self):
         return self.columns
 
     def GetCount(self):
-        return len(self.game_selections)
+        return len(self.pgn_index)
+
+    def GetGame(self, index):
+        """ Get game, reading it from file if not cached
+        :index: raw index into full list
+        """
+        if index not in self.games:
+            self.games[index] = self.pgn_index.get_game(index)
+        return self.games[index]
 
     def GetItem(self, index):
         """ Get item - tuple of data for columns selection
+        Columns are from the index's tags, the game is read
+        only for a column not in them
         :index: raw index into full list
+        :returns: (column data,..., index) - see GetGame
         """
-        row = self.game_selections[index]
-        row_index = row[0]
-        row_game = row[1]
+        tags = self.pgn_index.get_tags(index)
         item_l =  []
         for column in self.columns:
             if column == "Index":
-                item_l.append(row_index)
+                item_l.append(index+1)
+            elif column in tags:
+                item_l.append(tags[column])
             else:
+                row_game = self.GetGame(index)
                 if hasattr(row_game, column):
                     item_l.append(getattr(row_game, column))
                 else:
                     item_l.append("???")
-        item_l.append(row_game)            
+        item_l.append(index)            # game read when selected
         return tuple(item_l)
 
     def UpdateCache(self, start, end):
-        pass
+        """ Keep just the games of rows about to be shown
+        Games are read as needed, by GetItem, GetGame
+        :start, end: first, last row index
+        """
+        self.games = {index : game for index, game in self.games.items()
+                      if start <= index <= end}
     
 if __name__ == '__main__':
     import os
@@ -389,13 +389,13 @@ def goto_move_idx(input):
     val_str = goto_match.group(1)
     move_idx = int(val_str)
     stop_loop()
-    if move_idx < 0 or move_idx > len(cbs.board_stack)-1:
+    if move_idx < 0 or move_idx > len(cbs)-1:
         while do_move() is not None:
             pass
 
     if move_idx < 0:
-        move_idx = len(cbs.board_stack)+move_idx
-    if move_idx >= 0 and move_idx < len(cbs.board_stack):
+        move_idx = len(cbs)+move_idx
+    if move_idx >= 0 and move_idx < len(cbs):
         cbs.set_cur_bd_index(move_idx)
         display_board()
 
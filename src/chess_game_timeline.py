@@ -0,0 +1,149 @@
+#chess_game_timeline.py 18Oct2026  crs, Author
+"""
+Ply by ply positions of a game, computed once when the game
+is loaded, so going to any move is a lookup rather than a
+replay of the moves before it.
+Index 0 is the starting position, index n the position after
+the nth half move.  Each position is kept compactly as a
+PositionSnapshot with the move (ChessMove) which produced it.
+Replay stops at the game result or at the first move which
+does not decode (err, err_index).
+No display (wx) objects are used, so a timeline may be built
+off the main thread.
+"""
+from chessboard import Chessboard
+from chess_move import ChessMove
+
+class ChessGameTimeline:
+    def __init__(self, moves=None, game=None, board=None):
+        """ Setup timeline, positions are added by build/add_next
+        :moves: list of move specifications e.g. ["e4", "e5",...]
+            OR
+        :game: PGN game, using game.moves
+        :board: starting position, not changed
+                default: standard starting position
+        """
+        if moves is None:
+            moves = [] if game is None else game.moves
+        self.specs = list(moves)
+        if board is None:
+            board = Chessboard()
+        self.board = board.copy(include_history=False)  # Replay board
+        self.spec_index = 0     # Next spec to replay
+        self.snapshots = [self.board.get_snapshot()]  # by ply
+        self.moves = [self.board.cm]    # ChessMove producing position
+        self.moved = [tuple(self.board.moved_pieces_d)]  # moved piece origins
+        self.keys = [self.board.get_zobrist_key()]  # Zobrist key by ply
+        self.game_result = None     # Game result, if reached
+        self.err = None             # First decode error, if any
+        self.err_index = None       # spec index of error
+
+    def __len__(self):
+        """ Number of positions, including the starting position
+        """
+        return len(self.snapshots)
+
+    def is_done(self):
+        """ Check if replay is finished: out of moves,
+        game result or error
+        """
+        return (self.err is not None or self.game_result is not None
+                or self.spec_index >= len(self.specs))
+
+    def add_next(self):
+        """ Replay next move specification
+        :returns: True if a position was added
+        """
+        if self.is_done():
+            return False
+
+        spec = self.specs[self.spec_index]
+        board = self.board
+        cm = ChessMove(board, spec=spec)
+        board.cm = cm
+        if cm.decode(spec):
+            self.err = cm.err if cm.err is not None else f"bad move {spec}"
+            self.err_index = self.spec_index
+            return False
+
+        if cm.game_result is not None:
+            self.game_result = cm.game_result
+            self.spec_index += 1
+            return False
+
+        cm.make_move()
+        self.spec_index += 1
+        self.snapshots.append(board.get_snapshot())
+        self.moves.append(cm)
+        self.moved.append(tuple(board.moved_pieces_d))
+        self.keys.append(board.get_zobrist_key())
+        return True
+
+    def build(self):
+        """ Replay all moves
+        :returns: self, for chaining
+        """
+        while self.add_next():
+            pass
+        return self
+
+    def get_snapshot(self, index):
+        """ Get position
+        :index: ply index 0 - start, negative from end
+        :returns: PositionSnapshot
+        """
+        return self.snapshots[index]
+
+    def get_move(self, index):
+        """ Get move which produced position
+        :index: ply index
+        :returns: ChessMove, None for start
+        """
+        return self.moves[index]
+
+    def get_board(self, index, engine="mailbox"):
+        """ Make board for position
+        :index: ply index 0 - start, negative from end
+        :engine: board engine default: "mailbox"
+        :returns: new Chessboard, with its move (cm) set,
+                a copy bound to the new board
+        """
+        board = self.snapshots[index].to_board(engine=engine)
+        cm = self.moves[index]
+        board.cm = None if cm is None else cm.copy(board)
+        board.moved_pieces_d = dict.fromkeys(self.moved[index], True)
+        return board
+
+
+if __name__ == "__main__":
+    import time
+    import pgn
+    from graphics_braille.select_trace import SlTrace
+
+    demo_game_text = """
+    [Event "Third Rosenwald Trophy"]
+    [Result "0-1"]
+    [White "Donald Byrne"]
+    [Black "Robert James Fischer"]
+    1.Nf3 Nf6 2.c4 g6 3.Nc3 Bg7 4.d4 O-O
+    5.Bf4 d5 6.Qb3 dxc4 7.Qxc4 c6 8.e4 Nbd7
+    9.Rd1 Nb6 10.Qc5 Bg4 11.Bg5 Na4 12.Qa3 Nxc3
+    13.bxc3 Nxe4 14.Bxe7 Qb6 15.Bc4 Nxc3 16.Bc5 Rfe8+
+    17.Kf1 Be6 18.Bxb6 Bxc4+ 19.Kg1 Ne2+ 20.Kf1 Nxd4+
+    21.Kg1 Ne2+ 22.Kf1 Nc3+ 23.Kg1 axb6 24.Qb4 Ra4
+    25.Qxb6 Nxd1 26.h3 Rxa2 27.Kh2 Nxf2 28.Re1 Rxe1
+    29.Qd8+ Bf8 30.Nxe1 Bd5 31.Nf3 Ne4 32.Qb8 b5
+    33.h4 h5 34.Ne5 Kg7 35.Kg1 Bc5+ 36.Kf1 Ng3+
+    37.Ke1 Bb4+ 38.Kd1 Bb3+ 39.Kc1 Ne2+ 40.Kb1
+    Nc3+ 41.Kc1 Rc2# 0-1
+    """
+    SlTrace.clearFlags()
+    game = pgn.loads(demo_game_text)[0]
+    time_start = time.time()
+    timeline = ChessGameTimeline(game=game).build()
+    dur = time.time() - time_start
+    SlTrace.lg(f"{len(timeline)} positions in {dur:.3f} sec"
+               f" result: {timeline.game_result} err: {timeline.err}")
+    SlTrace.lg(f"end: {timeline.get_board(-1).board_to_fen_str()}")
+    SlTrace.lg(f"after 10. {timeline.get_move(20).spec}:"
+               f" {timeline.get_board(20).board_to_fen_str()}")
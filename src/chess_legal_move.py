@@ -0,0 +1,69 @@
+#chess_legal_move.py 18Oct2026  crs, Author
+"""
+One legal move, as produced by Chessboard.generate_legal_moves
+Castling, en passant and promotion are explicit fields so
+callers need not rediscover them from the squares.
+"""
+
+class ChessLegalMove:
+    __slots__ = ("piece", "orig_sq", "dest_sq", "captured",
+                 "capture_sq", "promoted_piece",
+                 "is_castle", "rook_orig_sq", "rook_dest_sq",
+                 "is_en_passant")
+
+    def __init__(self, piece, orig_sq, dest_sq,
+                 captured=None,
+                 capture_sq=None,
+                 promoted_piece=None,
+                 is_castle=False,
+                 rook_orig_sq=None,
+                 rook_dest_sq=None,
+                 is_en_passant=False):
+        """ Setup move
+        :piece: moving piece e.g. N
+        :orig_sq: origin square
+        :dest_sq: destination square
+        :captured: captured piece, None if not a capture
+        :capture_sq: square of captured piece, differs from dest_sq
+                    only for en passant
+        :promoted_piece: piece replacing pawn, None if not a promotion
+        :is_castle: True if castling (king's move)
+        :rook_orig_sq,rook_dest_sq: castling rook's squares
+        :is_en_passant: True if en passant capture
+        """
+        self.piece = piece
+        self.orig_sq = orig_sq
+        self.dest_sq = dest_sq
+        self.captured = captured
+        self.capture_sq = capture_sq
+        self.promoted_piece = promoted_piece
+        self.is_castle = is_castle
+        self.rook_orig_sq = rook_orig_sq
+        self.rook_dest_sq = rook_dest_sq
+        self.is_en_passant = is_en_passant
+
+    def is_capture(self):
+        """ True if move captures
+        """
+        return self.captured is not None
+
+    def uci(self):
+        """ Long algebraic (UCI) form e.g. e2e4, e7e8q
+        """
+        move = self.orig_sq + self.dest_sq
+        if self.promoted_piece is not None:
+            move += self.promoted_piece.lower()
+        return move
+
+    def __eq__(self, other):
+        if not isinstance(other, ChessLegalMove):
+            return NotImplemented
+        return (self.orig_sq == other.orig_sq
+                and self.dest_sq == other.dest_sq
+                and self.promoted_piece == other.promoted_piece)
+
+    def __hash__(self):
+        return hash((self.orig_sq, self.dest_sq, self.promoted_piece))
+
+    def __repr__(self):
+        return f"ChessLegalMove({self.piece}{self.uci()})"
@@ -0,0 +1,118 @@
+#chess_mailbox.py 18Oct2026  crs, Author
+"""
+Integer indexed ("mailbox") board geometry
+The board is a flat list, with a border of off-board
+guard squares, so that stepping in a direction is just
+adding an integer offset:
+    width:  nsqx + 2    one guard file each side
+                        (a two file knight jump off one side
+                        lands on the other side's guard file)
+    height: nsqy + 4    two guard ranks top and bottom
+For the standard board this is the 10x12 mailbox.
+
+The geometry depends only on board size so one instance
+per size is shared by all boards.
+"""
+
+class ChessMailbox:
+    OFF_BOARD = "#"         # Contents of guard squares
+
+    # Piece movement directions (file change, rank change)
+    # Same order as ChessPieceMovement.piece_type_dir_d
+    piece_type_dirs = {
+        "n" : [(1,2), (2,1), (2,-1), (1,-2),
+               (-1,-2), (-2,-1), (-2,1), (-1,2)],
+        "b" : [(1,1), (1,-1), (-1,-1), (-1,1)],
+        "r" : [(0,1), (1,0), (0,-1), (-1,0)],
+    }
+    piece_type_dirs["q"] = piece_type_dirs["r"] + piece_type_dirs["b"]
+    piece_type_dirs["k"] = piece_type_dirs["q"]
+
+    mailbox_by_size = {}    # ChessMailbox by (nsqx,nsqy)
+
+    @classmethod
+    def get_mailbox(cls, nsqx=8, nsqy=8):
+        """ Get shared mailbox geometry for board size
+        :nsqx: number of files default: 8
+        :nsqy: number of ranks default: 8
+        :returns: ChessMailbox instance
+        """
+        size = (nsqx, nsqy)
+        if size not in cls.mailbox_by_size:
+            cls.mailbox_by_size[size] = ChessMailbox(nsqx, nsqy)
+        return cls.mailbox_by_size[size]
+
+    def __init__(self, nsqx=8, nsqy=8):
+        """ Setup geometry
+        :nsqx: number of files
+        :nsqy: number of ranks
+        """
+        self.nsqx = nsqx
+        self.nsqy = nsqy
+        self.width = nsqx + 2
+        self.height = nsqy + 4
+        self.size = self.width*self.height
+        self.sq_index = {}                  # mailbox index by sq
+        self.index_sq = [None]*self.size    # sq by index, None if off board
+        self.index_file_rank = [None]*self.size # (file,rank) by index
+        for rank in range(1, nsqy+1):
+            for file in range(1, nsqx+1):
+                index = self.file_rank_to_index(file, rank)
+                sq = chr(ord('a')+file-1) + chr(ord('1')+rank-1)
+                self.sq_index[sq] = index
+                self.index_sq[index] = sq
+                self.index_file_rank[index] = (file,rank)
+        self.on_board_indexes = list(self.sq_index.values())
+        self.piece_type_offsets = {}    # index offsets by piece type
+        for piece_type, dirs in self.piece_type_dirs.items():
+            self.piece_type_offsets[piece_type] = [
+                self.dir_to_offset(dir) for dir in dirs]
+
+    def __deepcopy__(self, memo):
+        """ Geometry is never changed so is shared by copies
+        """
+        return self
+
+    def file_rank_to_index(self, file, rank):
+        """ Convert file, rank to mailbox index
+        :file: file int 1-nsqx
+        :rank: rank int 1-nsqy
+        :returns: index
+        """
+        return (rank+1)*self.width + file
+
+    def dir_to_offset(self, dir):
+        """ Convert direction to index offset
+        :dir: (x_inc, y_inc) or (x_inc, y_inc, special)
+        :returns: index offset
+        """
+        return dir[1]*self.width + dir[0]
+
+    def new_setting(self):
+        """ Create empty board contents
+        :returns: list, None for on board squares,
+                OFF_BOARD for guard squares
+        """
+        setting = [self.OFF_BOARD]*self.size
+        for index in self.on_board_indexes:
+            setting[index] = None
+        return setting
+
+    def adj_sq(self, sq, dir):
+        """ Get adjacent square in direction, if one step
+        stays within the guard border
+        :sq: square e.g. a1
+        :dir: (x_inc,y_inc) or (x_inc, y_inc, special)
+                 each change must be within -2..2
+        :returns: adjacent sq, None if off board
+        """
+        return self.index_sq[self.sq_index[sq] + dir[1]*self.width + dir[0]]
+
+
+if __name__ == "__main__":
+    mbx = ChessMailbox.get_mailbox()
+    print(f"width:{mbx.width} height:{mbx.height} size:{mbx.size}")
+    print(f"a1:{mbx.sq_index['a1']} h8:{mbx.sq_index['h8']}")
+    print(f"knight offsets: {mbx.piece_type_offsets['n']}")
+    for sq, dir in [("a1",(1,2)), ("h1",(2,1)), ("a8",(-2,1)), ("e4",(1,1))]:
+        print(f"{sq} + {dir} = {mbx.adj_sq(sq, dir)}")
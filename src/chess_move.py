@@ -1,6 +1,5 @@
 #chess_move.py
-
-import re
+import copy
 
 from graphics_braille.select_trace import SlTrace
 
@@ -9,6 +8,18 @@ from chess_move_notation import ChessMoveNotation
 from chess_piece_movement import  ChessPieceMovement
 
 class ChessMove:
+    # What decode resolves a spec to, kept in the SAN cache
+    # A decoded move, cache hit or not, has these set;
+    # capt_piece, capt_sq are not set by decode
+    RESOLVED_ATTRS = ("orig_sq", "dest_sq", "dest_sq_mod",
+                      "orig2_sq", "dest2_sq", "dest2_sq_mod",
+                      "promoted_piece", "en_passant_sq",
+                      "game_result", "has_movement",
+                      "piece", "piece_type", "is_capture",
+                      "is_castle", "is_castle_kingside",
+                      "is_castle_queenside",
+                      "is_check", "is_check_mate")
+
     def __init__(self, board, spec=None):
         self.setup()        # Initialize state    
         self.board = board
@@ -45,6 +56,20 @@ class ChessMove:
     def __repr__(self):
         return self.__str__()
 
+    def copy(self, board=None):
+        """ Copy move, e.g. for another board in the same position
+        :board: board the copy decodes, makes moves on
+            default: this move's board
+        :returns: ChessMove, with this move's resolved settings
+        """
+        if board is None:
+            board = self.board
+        cm = copy.copy(self)
+        cm.board = board
+        cm.cmn = ChessMoveNotation(cm)
+        cm.cpm = ChessPieceMovement(board)
+        return cm
+
     def setup(self):
         """ Setup initial state
         which can be updated via decode...
@@ -57,6 +82,8 @@ class ChessMove:
         self.is_check_mate = False  # True if mate
         
         self.is_capture = False # True == capture made
+        self.capt_piece = None  # captured piece, if known
+        self.capt_sq = None     # captured piece's square, if known
         self.piece = None       # set later
         self.piece_type = None  # piece type k - king
         self.orig_sq = None     # set up later
@@ -72,6 +99,17 @@ class ChessMove:
         self.is_castle_queenside = False # castle queenside
         self.update = None
         
+    def reset(self, spec=None):
+        """ Ready move for reuse as its board's next move
+        e.g. one ChessMove for all of a game's moves
+        (Chessboard.replay_game)
+        :spec: move specification default: none yet
+        """
+        self.setup()
+        self.move_no = self.board.get_move_no()
+        self.to_move = self.board.get_to_move()
+        self.spec = spec
+        
     def decode(self, spec):
         """ Decode move spec, in preparation for verification,
         execution.  Results are updated for successful parse
@@ -85,6 +123,16 @@ class ChessMove:
         #
         self.spec = spec
         
+        # Same spec, same position - same move
+        san_cache = self.board.san_cache
+        if san_cache is not None:
+            san_key = (self.board.get_zobrist_key(), spec)
+            resolved = san_cache.get(san_key)
+            if resolved is not None:
+                for attr, value in zip(self.RESOLVED_ATTRS, resolved):
+                    setattr(self, attr, value)
+                return None
+            
         # Parse basic notation
         if self.cmn.decode_spec_parts(spec=spec):
             return self.cmn.err
@@ -99,6 +147,9 @@ class ChessMove:
             return self.cmn.err         # return completed
         
         self.cmn.make_move_update()     # Update parse results
+        if self.err is None and san_cache is not None:
+            san_cache.put(san_key, tuple(getattr(self, attr)
+                                         for attr in self.RESOLVED_ATTRS))
         return self.err
 
     def get_move_desc(self):
@@ -124,77 +175,61 @@ class ChessMove:
     def get_orig_sq(self, piece, piece_choice=None,
                     dest_sq=None):
         """ Find move's original square
+        Works back from dest_sq to the squares of our piece
+        which reach it, narrowed by the disambiguation, then
+        checked for legality
         :piece: piece to move e.g. K,Q...P
-        :piece_choice: disambiguation if choice
+        :piece_choice: disambiguation if choice e.g. b, 5, h4
         :dest_sq:  destination square
         :returns: sq, None if none apply
         """
-        ps_d = self.get_pieces(piece)   # our pieces on bd
-        orig_sqs = []       # Filled with origin squares
-        for ps in ps_d:
-            sq = self.ps_to_sq(ps)
-            sq_dest_d = self.get_move_to_sqs(piece=piece,
-                                orig_sq=sq)
-            if dest_sq in sq_dest_d:
-                orig_sqs.append(sq)
-                
-        if len(orig_sqs) == 1:
-            return orig_sqs[0]  # One and only one
+        board = self.board
+        orig_sqs = board.get_orig_sqs(piece, dest_sq)
+        chosen_sqs = self.choose_orig_sqs(orig_sqs, piece_choice)
+        legal_sqs = board.get_legal_orig_sqs(piece, dest_sq,
+                                             orig_sqs=chosen_sqs)
+        if len(legal_sqs) == 0 and len(chosen_sqs) < len(orig_sqs):
+            # Disambiguation fits no legal move - take the only one
+            legal_sqs = board.get_legal_orig_sqs(piece, dest_sq,
+                            orig_sqs=[sq for sq in orig_sqs
+                                      if sq not in chosen_sqs])
+        if len(legal_sqs) == 1:
+            return legal_sqs[0]  # One and only one
         
-        if len(orig_sqs) < 1:
+        if len(legal_sqs) < 1:
             return None         # No takers
-        
-        orig_sq_file = self.cmn.orig_sq_file
-        dest_file,dest_rank = self.sq_to_file_rank(dest_sq)
-        if orig_sq_file is None:
-            if len(piece_choice) > 0:
-                if len(piece_choice) == 1:
-                    orig_rank_or_file = piece_choice[0]
-                    if re.match(r'\d+', orig_rank_or_file):
-                        is_rank = True
-                    else:
-                        is_rank = False
-                        
-                    pos_sqs = []       # Possible squares
-                    for sq in orig_sqs:
-                        orig_f,orig_r = self.sq_to_file_rank(sq)
-                        if is_rank:
-                            if orig_r == orig_rank_or_file:
-                                pos_sqs.append(sq)
-                        else:
-                            if orig_f == orig_rank_or_file:
-                                pos_sqs.append(sq)
-                    
-                    if len(pos_sqs) == 0:
-                        return self.err_add(f"No possibilities for  spec:{self.spec}")
-                    
-                    if len(pos_sqs) == 1:
-                        return pos_sqs[0]     # Just enough == 1
-                    
-                    if len(pos_sqs) > 1:
-                        return self.err_add(f"Ambiguous spec:{self.spec}"
-                                            f" orig sqposibilities: {pos_sqs}")
-
-                if len(self.piece_choice) == 2:
-                    return self.err_add(f"TBD: two char piece_choice spec: {self.spec}")
 
-                if len(self.piece_choice) > 2:
-                    return self.err_add(f"Unrecognized piece_choice spec: {self.spec}")
-        
-        if orig_sq_file is not None:
-            pos_sqs = []
-            for sq in orig_sqs:
-                sq_file, sq_rank = self.sq_to_file_rank(sq)
-                if sq_file == orig_sq_file:
-                    pos_sqs.append(sq)
-            if len(pos_sqs) == 0:
-                self.err_add(f"No origin for spec:{self.spec}")
-                return None
-            
-            if len(pos_sqs) == 1:
-                return pos_sqs[0]     
+        self.err_add(f"Ambiguous spec:{self.spec}"
+                     f" orig sqposibilities: {legal_sqs}")
+        return None
 
-        return self.err_add(f"Don't handle piece_choice spec: {self.spec}")            
+    def choose_orig_sqs(self, orig_sqs, piece_choice=None):
+        """ Narrow origin squares by the spec's disambiguation
+        :orig_sqs: possible origin squares
+        :piece_choice: origin file and/or rank e.g. b, 5, h4
+        :returns: list of origin squares which fit
+        """
+        orig_file = self.cmn.orig_sq_file   # pawn's file e.g. exd5
+        orig_rank = None
+        if piece_choice:
+            for ch in piece_choice:
+                if ch.isdigit():
+                    orig_rank = (ch if orig_rank is None
+                                 else orig_rank + ch)
+                else:
+                    orig_file = ch
+        if orig_file is None and orig_rank is None:
+            return orig_sqs
+
+        chosen_sqs = []
+        for sq in orig_sqs:
+            sq_file, sq_rank = self.sq_to_file_rank(sq)
+            if orig_file is not None and sq_file != orig_file:
+                continue
+            if orig_rank is not None and sq_rank != orig_rank:
+                continue
+            chosen_sqs.append(sq)
+        return chosen_sqs
         
     def find_orig_sq(self):
         """ Determine original move square
@@ -370,7 +405,8 @@ class ChessMove:
                 None if error
         """
         return self.cpm.get_move_to_sqs(piece=piece,
-                                orig_sq=orig_sq)
+                                orig_sq=orig_sq,
+                                ck_for_check=ck_for_check)
 
 
 
@@ -0,0 +1,145 @@
+#chess_move_cache.py 18Oct2026  crs, Author
+"""
+Bounded LRU (least recently used) cache of legal move maps
+Keyed by position (Chessboard.get_legal_move_map builds the key
+from the Zobrist key, side and en passant square).
+A move map is a dictionary, by origin square, of the
+get_move_to_sqs result (dictionary, by destination square,
+of pre-move contents) - cached maps must not be modified.
+
+Games in an archive share long opening prefixes, so the same
+positions come up again and again.  One cache is shared by all
+boards (ChessMoveCache.get_default()).
+Access is locked, as boards on a worker thread (e.g. a game
+timeline being built) share the cache with the display's.
+"""
+import threading
+from collections import OrderedDict
+
+class ChessMoveCache:
+    DEFAULT_CAPACITY = 4096     # Number of positions
+    NAME = "move cache"         # For stats_str
+
+    default_cache = None        # Shared cache, see get_default
+
+    @classmethod
+    def get_default(cls):
+        """ Get cache shared by all boards
+        :returns: ChessMoveCache
+        """
+        if cls.default_cache is None:
+            cls.default_cache = cls()
+        return cls.default_cache
+
+    def __init__(self, capacity=None):
+        """ Setup cache
+        :capacity: maximum number of entries, 0 - no caching
+                default: DEFAULT_CAPACITY
+        """
+        if capacity is None:
+            capacity = self.DEFAULT_CAPACITY
+        self.capacity = capacity
+        self.entries = OrderedDict()    # Least recently used first
+        self.lock = threading.RLock()
+        self.clear_stats()
+
+    def __deepcopy__(self, memo):
+        """ Cache is shared, not copied, by board copies
+        """
+        return self
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """ Empty cache, keeping statistics
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def clear_stats(self):
+        """ Zero hit/miss/eviction counts
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_capacity(self, capacity):
+        """ Change capacity, evicting least recently used
+        entries if over the new capacity
+        :capacity: maximum number of entries, 0 - no caching
+        """
+        with self.lock:
+            self.capacity = capacity
+            self.evict()
+
+    def evict(self):
+        """ Drop least recently used entries till within capacity
+        """
+        with self.lock:
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key):
+        """ Look up entry, marking it most recently used
+        :key: position key
+        :returns: cached value, None if not present
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """ Add entry, as most recently used
+        :key: position key
+        :value: value (not None)
+        """
+        if self.capacity <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            self.evict()
+
+    def get_stats(self):
+        """ Get cache statistics
+        :returns: dictionary of size, capacity, hits, misses,
+                    evictions, hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size" : len(self.entries),
+            "capacity" : self.capacity,
+            "hits" : self.hits,
+            "misses" : self.misses,
+            "evictions" : self.evictions,
+            "hit_rate" : self.hits/lookups if lookups > 0 else 0.0,
+            }
+
+    def stats_str(self):
+        """ Get statistics as a printable string
+        """
+        stats = self.get_stats()
+        return (f"{self.NAME}: {stats['size']}/{stats['capacity']} entries"
+                f" hits: {stats['hits']} misses: {stats['misses']}"
+                f" evictions: {stats['evictions']}"
+                f" hit rate: {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    cache = ChessMoveCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # a now most recent
+    cache.put("c", 3)       # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    print(cache.stats_str())
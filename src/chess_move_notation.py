@@ -36,6 +36,8 @@ import re
 
 from graphics_braille.select_trace import SlTrace
 
+from chess_san_parts import SanParts
+
 
 class ChessMoveNotation:
     """ Do all chess move specification parsing
@@ -123,6 +125,13 @@ class ChessMoveNotation:
                 if in_dest_sq is not None:
                     return self.err_add(
                         f"Non-capture at {self.dest_sq} is occupied with {in_dest_sq}")
+        
+        if (self.piece is not None and self.dest_sq is not None
+                and not self.is_castle):
+            # Some piece must be able to get there
+            if not board.get_legal_orig_sqs(self.piece, self.dest_sq):
+                return self.err_add(
+                    f"No {self.piece} can move to {self.dest_sq}")
         return None         
                             
     def decode_spec_parts(self, spec):
@@ -161,68 +170,63 @@ class ChessMoveNotation:
         self.is_castle_queenside = False # castle queenside
         self.en_passant_sq = None           # Set to sq if executed
         self.promoted_piece = None          # Promoted piece, if any = use self.dest_sq_mod
-        spec_rem = spec     # remaining, adjusted as parts are decoded
+        # One pass over the spec, see SanParts
+        parts = SanParts.parse(spec)
+        if parts is None:
+            self.err = f"Can't determine active piece from {spec}"
+            self.err += f" {self.get_move_no()}."
+            self.err += f" spec: {self.spec}"
+            return self.err_add(self.err)
+        
         # Check if game result
-        if (match_res := re.match(r'(.*)\s*(([0-1]-[0-1])|(1/2-1/2)|\*)\s*$', spec_rem)):
-            mr_list = list(match_res.groups())
-            spec_rem = mr_list[0]
-            self.game_result = mr_list[1]
-            if spec_rem == "":
+        if parts.result is not None:
+            self.game_result = parts.result
+            if not parts.has_movement():
                 self.has_movement=False
                 return self.err_add()   # Done with parsing
              
         # Check if check or mate
-        if (match_res := re.match(r'(.*)\s*([+#])\s*$', spec_rem)):
-            spec_rem,check_or_mate = match_res.groups()
-            if check_or_mate == '+':
+        if parts.check is not None:
+            if parts.check == '+':
                 self.is_check = True
             else:
                 self.is_check_mate = True    
-            self.spec_base = spec_base = spec_rem   # less check,mate
+            self.spec_base = parts.base     # less check,mate
         # Check if castle
-        if (match_castle := re.match(r'(O-O|O-O-O)$', spec_rem)):
+        if parts.castle is not None:
             self.is_castle = True
-            group1 = match_castle.group(1)
-            if  group1 == 'O-O-O':
+            if parts.castle == 'O-O-O':
                 self.is_castle_queenside = True
             else:
                 self.is_castle_kingside = True
             return None     # Done part checking
         
         # Check if promotion
-        if (match_promote := re.match(r'(.*)=([A-Z])$', spec_rem)):
-            spec_rem, promoted = match_promote.groups()
+        if parts.promoted is not None:
             if self.cm.get_to_move() == 'white':
-                self.promoted_piece = promoted.upper()
+                self.promoted_piece = parts.promoted.upper()
             else:
-                self.promoted_piece = promoted.lower()
+                self.promoted_piece = parts.promoted.lower()
             self.dest_sq_mod = self.promoted_piece  # duplication ???
             
-        # Pick off destination from tail end
-        # <file><rank> or <file>
-        if (match_res := re.match(r'(.*)([a-w]\d+)$', spec_rem)):
-            spec_rem,self.dest_sq = match_res.groups()
-        elif (match_res := re.match(r'(.*)([a-w])$', spec_rem)):
-            spec_rem,self.dest_sq_file = match_res.groups()
+        # Destination <file><rank> or <file>
+        self.dest_sq = parts.dest_sq
+        self.dest_sq_file = parts.dest_file
 
         # Determine if capture
-        if (match_res := re.match(r'(.*)([x:])$', spec_rem)):
+        if parts.capture:
             self.is_capture = True
-            spec_rem,self.capture_ind = match_res.groups()
             
         # Determine move active piece
-        if (match_res := re.match(r'([A-Z])(.*)$', spec_rem)):
-            piece, spec_rem = match_res.groups()
-            self.piece_type = self.piece_to_type(piece)
-            self.piece_choice = spec_rem
-        elif (match_res := re.match(r'([a-w])(.*)$', spec_rem)):
-            self.orig_sq_file,spec_rem = match_res.groups()
-            self.piece_choice = spec_rem
-        elif spec_rem == "":
+        self.piece_choice = parts.get_choice()
+        if parts.piece is not None:
+            self.piece_type = self.piece_to_type(parts.piece)
+        elif parts.from_file is not None:
+            self.orig_sq_file = parts.from_file
+        elif parts.from_rank is None:
             self.piece_type = 'p'
-            self.piece_choice = ""
         else:
-            self.err = f"Can't determine active piece from {spec_rem}"
+            self.err = f"Can't determine active piece from {parts.base}"
             self.err += f" {self.get_move_no()}."
             self.err += f" spec: {self.spec}"
             return self.err_add(self.err)
@@ -492,7 +496,15 @@ class ChessMoveNotation:
         move.dest2_sq_mod = self.dest2_sq_mod
         move.promoted_piece = self.promoted_piece   # Just to indicate promotion
         move.en_passant_sq = self.en_passant_sq
-        
+        move.piece = self.piece
+        move.piece_type = self.piece_type
+        move.is_capture = self.is_capture
+        move.is_castle = self.is_castle
+        move.is_castle_kingside = self.is_castle_kingside
+        move.is_castle_queenside = self.is_castle_queenside
+        move.is_check = self.is_check
+        move.is_check_mate = self.is_check_mate
+
         if self.err:
             move.err = self.err
         
@@ -0,0 +1,163 @@
+#chess_move_to_san.py 18Oct2026  crs, Author
+"""
+Standard algebraic notation (SAN) from moves - the reverse of
+ChessMove.decode.  For exporting games, the goto move grid and
+spoken move announcements.
+
+Built on the legal move machinery (check and pin limits,
+ChessPieceMovement.get_legal_orig_sqs): the legal origins of the
+moving piece's type to the destination give the disambiguation
+(Nbd7, R1e2, Qh4e1 only when needed) without generating every
+move of the position.  After the move, a check (+) is a mate (#)
+if Chessboard.generate_legal_moves finds no reply.
+moves_to_san converts a whole game in one pass of trial moves.
+
+Moves are ChessLegalMove or UCI (long algebraic) strings e.g.
+e2e4, e7e8q.
+"""
+import re
+
+from chess_legal_move import ChessLegalMove
+
+UCI_RE = re.compile(r'([a-w]\d+)([a-w]\d+)([qrbnQRBN])?$')
+
+def get_legal_move(board, move):
+    """ Check move is legal in board's position
+    :board: board (Chessboard)
+    :move: ChessLegalMove or UCI string e.g. e2e4, e7e8q
+    :returns: (ChessLegalMove, other legal origins of the same
+                piece to the destination), (None, None) if not legal
+    """
+    if isinstance(move, ChessLegalMove):
+        orig_sq, dest_sq = move.orig_sq, move.dest_sq
+        promoted_piece = move.promoted_piece
+    elif (match := UCI_RE.match(move)):
+        orig_sq, dest_sq, promoted_piece = match.groups()
+    else:
+        return None, None
+
+    piece = board.get_piece(orig_sq)
+    if piece is None or board.piece_color(piece) != board.to_move:
+        return None, None
+
+    legal_orig_sqs = board.get_legal_orig_sqs(piece, dest_sq)
+    if orig_sq not in legal_orig_sqs:
+        return None, None
+
+    piece_type = piece.lower()
+    last_rank = str(board.nsqy) if piece.isupper() else "1"
+    if piece_type == 'p' and dest_sq[1:] == last_rank:
+        if promoted_piece is None or promoted_piece.lower() == 'p':
+            return None, None
+        promoted_piece = (promoted_piece.upper() if piece.isupper()
+                          else promoted_piece.lower())
+    elif promoted_piece is not None:
+        return None, None
+
+    captured = board.get_piece(dest_sq)
+    capture_sq = None if captured is None else dest_sq
+    is_en_passant = False
+    if (piece_type == 'p' and captured is None
+            and dest_sq[0] != orig_sq[0]):
+        is_en_passant = True
+        capture_sq = dest_sq[0] + orig_sq[1:]
+        captured = board.get_piece(capture_sq)
+    is_castle = (piece_type == 'k'
+                 and abs(ord(dest_sq[0]) - ord(orig_sq[0])) == 2)
+    legal_move = ChessLegalMove(piece, orig_sq, dest_sq,
+                                captured=captured,
+                                capture_sq=capture_sq,
+                                promoted_piece=promoted_piece,
+                                is_castle=is_castle,
+                                is_en_passant=is_en_passant)
+    return legal_move, [sq for sq in legal_orig_sqs if sq != orig_sq]
+
+def get_san_base(move, other_orig_sqs):
+    """ SAN without check or mate mark
+    :move: legal move (ChessLegalMove)
+    :other_orig_sqs: other legal origins of the same piece
+            to the destination, for disambiguation
+    :returns: SAN e.g. Nbd7, exd5, e8=Q, O-O
+    """
+    if move.is_castle:
+        return "O-O" if move.dest_sq[0] > move.orig_sq[0] else "O-O-O"
+
+    capture = "x" if move.captured is not None else ""
+    piece_type = move.piece.upper()
+    if piece_type == "P":
+        san = move.orig_sq[0] + capture if capture else ""
+        san += move.dest_sq
+        if move.promoted_piece is not None:
+            san += "=" + move.promoted_piece.upper()
+        return san
+
+    orig_file, orig_rank = move.orig_sq[0], move.orig_sq[1:]
+    choice = ""
+    if other_orig_sqs:
+        if all(sq[0] != orig_file for sq in other_orig_sqs):
+            choice = orig_file
+        elif all(sq[1:] != orig_rank for sq in other_orig_sqs):
+            choice = orig_rank
+        else:
+            choice = orig_file + orig_rank
+    return piece_type + choice + capture + move.dest_sq
+
+def get_check_mark(board):
+    """ Check or mate mark for side to move
+    :board: board after the move (Chessboard)
+    :returns: "#" mate, "+" check, "" neither
+    """
+    info = board.cpm.get_check_pin_info(board.to_move)
+    if info is None or not info.is_in_check():
+        return ""
+
+    return "+" if board.generate_legal_moves() else "#"
+
+def move_to_san(board, move):
+    """ Get SAN for a move in the board's position
+    Board is unchanged on return
+    :board: board (Chessboard), move's side to move
+    :move: ChessLegalMove or UCI string e.g. g1f3
+    :returns: SAN e.g. Nf3, exd8=Q+, None if not a legal move
+    """
+    return sans[0] if (sans := moves_to_san(board, [move])) else None
+
+def moves_to_san(board, moves):
+    """ Get SAN for a sequence of moves e.g. a game, in one pass
+    Board is unchanged on return
+    :board: board (Chessboard) at the starting position
+    :moves: ChessLegalMove or UCI strings, in order
+    :returns: list of SAN, stopping before the first move
+            which is not legal (shorter than moves)
+    """
+    sans = []
+    ntrial = 0          # trial moves to undo
+    try:
+        for move in moves:
+            legal_move, other_orig_sqs = get_legal_move(board, move)
+            if legal_move is None:
+                break
+
+            san = get_san_base(legal_move, other_orig_sqs)
+            board.make_trial_move(legal_move.orig_sq, legal_move.dest_sq,
+                                  promoted_piece=legal_move.promoted_piece)
+            ntrial += 1
+            sans.append(san + get_check_mark(board))
+    finally:
+        for _ in range(ntrial):
+            board.unmake_trial_move()
+    return sans
+
+
+if __name__ == "__main__":
+    from chessboard import Chessboard
+
+    cb = Chessboard()
+    print(moves_to_san(cb, ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4",
+                            "g8f6", "f3g5", "d7d5", "e4d5", "f6d5",
+                            "g5f7", "e8f7", "d1f3", "f7e6", "b1c3",
+                            "c6b4", "e1g1"]))
+    cb.fen_setup("6k1/5ppp/8/8/8/8/1R3PPP/1R4K1 w - - 0 1")
+    print(move_to_san(cb, "b2b8"), move_to_san(cb, "b1b8"))
+    cb.fen_setup("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+    print(move_to_san(cb, "b7b8q"), move_to_san(cb, "b7b8n"))
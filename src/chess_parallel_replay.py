@@ -0,0 +1,132 @@
+#chess_parallel_replay.py 18Oct2026  crs, Author
+"""
+Parse and replay the games of PGN files on several processes
+(concurrent.futures.ProcessPoolExecutor), e.g. to check a whole
+archive.
+
+Work is split at game boundaries, using each file's offset index
+(PgnIndex), into chunks of a fixed number of games, so one large
+file is shared among the workers rather than holding up the
+others.  A worker reads its chunk's games straight from their
+offsets and replays them with Chessboard.replay_game.
+
+Results are streamed back in file and game order whatever the
+number of workers.
+
+Usage: python chess_parallel_replay.py [-g games_dir] [-w workers]
+                                       [-c chunk] [-e engine]
+"""
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from graphics_braille.select_trace import SlTrace
+
+import pgn
+from pgn_index import PgnIndex, read_game_text
+from chessboard import Chessboard
+from chess_replay_result import ChessReplayResult
+
+DEFAULT_CHUNK = 50          # Games per task
+
+def get_tasks(file_names, chunk=DEFAULT_CHUNK, engine="mailbox"):
+    """ Split files' games into tasks of chunk games
+    :file_names: PGN files
+    :chunk: games per task
+    :engine: board engine
+    :returns: list of (file_name, first game index,
+                        [(offset, length),...], engine)
+    """
+    tasks = []
+    for file_name in file_names:
+        index = PgnIndex.get_index(file_name)
+        spans = [(offset, length) for offset, length, _ in index.entries]
+        for start_i in range(0, len(spans), chunk):
+            tasks.append((file_name, start_i, spans[start_i:start_i+chunk],
+                          engine))
+    return tasks
+
+def replay_task(task):
+    """ Parse and replay a task's games - run in a worker
+    :task: (file_name, first game index, [(offset, length),...], engine)
+    :returns: list of (file_name, game index, ChessReplayResult),
+            one per span.  A span whose text can't be read or isn't
+            one game, or whose replay raises, has err set, err_index -1
+    """
+    file_name, start_i, spans, engine = task
+    results = []
+    with open(file_name, "rb") as game_file:
+        for game_index, (offset, length) in enumerate(spans, start_i):
+            try:
+                games = pgn.loads(read_game_text(game_file, offset, length))
+                if len(games) != 1:
+                    raise ValueError(f"{len(games)} games in game text")
+                cb = Chessboard(engine=engine)
+                result = cb.replay_game(games[0].moves)
+            except Exception as e:      # Report game, keep going
+                result = ChessReplayResult()
+                result.err = f"game not replayed: {e}"
+                result.err_index = -1
+            results.append((file_name, game_index, result))
+    return results
+
+def parallel_replay(file_names, workers=None, chunk=DEFAULT_CHUNK,
+                    engine="mailbox"):
+    """ Replay the games of files, on worker processes
+    :file_names: PGN files
+    :workers: number of worker processes
+            default: os.cpu_count()  1: no workers, in this process
+    :chunk: games per task default: DEFAULT_CHUNK
+    :engine: board engine default: mailbox
+    :returns: (file_name, game index, ChessReplayResult) for each
+            game, in file and game order
+    """
+    tasks = get_tasks(file_names, chunk=chunk, engine=engine)
+    if workers == 1:
+        for task in tasks:
+            yield from replay_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(replay_task, tasks):
+            yield from results
+
+
+if __name__ == "__main__":
+    games_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "games")
+    workers = os.cpu_count()
+    chunk = DEFAULT_CHUNK
+    engine = "mailbox"
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-g', '--games_dir', default=games_dir,
+                        help=f"PGN games directory (default:{games_dir})")
+    parser.add_argument('-w', '--workers', type=int, default=workers,
+                        help=f"Worker processes, 1 - none (default:{workers})")
+    parser.add_argument('-c', '--chunk', type=int, default=chunk,
+                        help=f"Games per task (default:{chunk})")
+    parser.add_argument('-e', '--engine', default=engine,
+                        help=f"Board engine (default:{engine})")
+    args = parser.parse_args()             # or die "Illegal options"
+
+    SlTrace.clearFlags()
+    file_names = [os.path.join(args.games_dir, name)
+                  for name in sorted(os.listdir(args.games_dir))
+                  if name.endswith(".pgn")]
+    ngame = nply = nerr = 0
+    time_start = time.time()
+    for file_name, game_index, result in parallel_replay(file_names,
+                                    workers=args.workers, chunk=args.chunk,
+                                    engine=args.engine):
+        ngame += 1
+        nply += result.nply
+        if not result.is_ok():
+            nerr += 1
+            SlTrace.lg(f"{os.path.basename(file_name)} game {game_index+1}:"
+                       f" {result}")
+    dur = time.time() - time_start
+    SlTrace.lg(f"{ngame} games {nply} moves {nerr} in error"
+               f" {dur:.2f} sec {ngame/dur if dur > 0 else 0:.0f} games/sec"
+               f" workers: {args.workers} chunk: {args.chunk}")
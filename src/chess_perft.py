@@ -0,0 +1,104 @@
+#chess_perft.py 18Oct2026  crs, Author
+"""
+Perft - move generator correctness and speed
+Counts the leaf nodes of the legal move tree, to a given depth,
+for a set of standard positions and compares them with the
+published counts.  Reports nodes/sec for each engine backend
+(Chessboard engine= "mailbox", "dict", "bitboard") so move
+generation regressions show up as numbers.
+
+Usage: python chess_perft.py [-e engine,...] [-d depth]
+                             [-p position,...] [--divide]
+"""
+import time
+import argparse
+
+from graphics_braille.select_trace import SlTrace
+
+from chessboard import Chessboard
+
+"""
+Standard perft positions with known node counts, by depth
+From https://www.chessprogramming.org/Perft_Results
+"""
+perft_positions = {
+    "start" : ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+               {1:20, 2:400, 3:8902, 4:197281}),
+    "kiwipete" : ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+               {1:48, 2:2039, 3:97862, 4:4085603}),
+    "en_passant" : ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",     # position 3
+               {1:14, 2:191, 3:2812, 4:43238}),
+    "promotion" : ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", # position 4
+               {1:6, 2:264, 3:9467, 4:422333}),
+    "position5" : ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+               {1:44, 2:1486, 3:62379, 4:2103487}),
+    }
+
+def run_perft(name, engine, depth=None, divide=False):
+    """ Run perft on one position with one engine
+    :name: perft_positions key
+    :engine: Chessboard engine
+    :depth: depth default: deepest known count <= 3
+    :divide: True - list counts by first move
+    :returns: True if count matches known count (or none known)
+    """
+    fen, known_counts = perft_positions[name]
+    if depth is None:
+        depth = min(3, max(known_counts))
+    cb = Chessboard(pieces="FEN:"+fen, engine=engine)
+    time_start = time.time()
+    if divide:
+        counts = cb.divide(depth)
+        for move in sorted(counts):
+            SlTrace.lg(f"    {move}: {counts[move]}")
+        nodes = sum(counts.values())
+    else:
+        nodes = cb.perft(depth)
+    dur = time.time() - time_start
+    known = known_counts.get(depth)
+    if known is None:
+        result = "(no known count)"
+        ok = True
+    elif nodes == known:
+        result = "OK"
+        ok = True
+    else:
+        result = f"FAIL expected {known}"
+        ok = False
+    nodes_per_sec = nodes/dur if dur > 0 else 0
+    SlTrace.lg(f"{name:11} {engine:8} depth {depth}: {nodes:8} nodes"
+               f" {dur:7.2f} sec {nodes_per_sec:8.0f} nodes/sec  {result}")
+    return ok
+
+
+if __name__ == "__main__":
+    engines = ",".join(Chessboard.ENGINES)
+    positions = ",".join(perft_positions)
+    depth = None
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-e', '--engines', default=engines,
+                        help=("Comma separated engines"
+                                f" (default:{engines})"))
+    parser.add_argument('-d', '--depth', type=int, default=depth,
+                        help=("Perft depth"
+                                " (default: up to 3, by position)"))
+    parser.add_argument('-p', '--positions', default=positions,
+                        help=("Comma separated positions"
+                                f" (default:{positions})"))
+    parser.add_argument('--divide', action='store_true', default=False,
+                        help=("List node counts by first move"
+                                " (default: totals only)"))
+    args = parser.parse_args()             # or die "Illegal options"
+
+    SlTrace.clearFlags()
+    nfail = 0
+    for name in args.positions.split(","):
+        for engine in args.engines.split(","):
+            if not run_perft(name, engine, depth=args.depth,
+                             divide=args.divide):
+                nfail += 1
+    if nfail > 0:
+        SlTrace.lg(f"{nfail} FAIL{'S' if nfail > 1 else ''}")
+    else:
+        SlTrace.lg("NO FAILS")
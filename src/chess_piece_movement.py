@@ -9,6 +9,7 @@ import re
 from graphics_braille.select_trace import SlTrace
 
 from chess_error import ChessError
+from chess_legal_move import ChessLegalMove
 
 class CastleInfo:
 
@@ -25,6 +26,27 @@ class CastleInfo:
         self.king_sq = king_sq      # Original sq
         self.rook_sq = rook_sq
         
+class CheckPinInfo:
+    """ Side's king safety for one position
+    (see ChessPieceMovement.get_check_pin_info)
+    """
+    def __init__(self,
+            king_sq = None,         # our king's square
+            checkers = None,        # squares of pieces giving check
+            check_mask = None,      # None - not in check, else
+                                    # squares a non-king move must end on
+            pins = None,            # by pinned piece's sq, squares
+                                    # it may move to (pin ray)
+            ):
+        self.king_sq = king_sq
+        self.checkers = [] if checkers is None else checkers
+        self.check_mask = check_mask
+        self.pins = {} if pins is None else pins
+
+    def is_in_check(self):
+        return len(self.checkers) > 0
+
+        
 class ChessPieceMovement:
 
     """
@@ -81,6 +103,8 @@ class ChessPieceMovement:
         self.board = board
         self.spec = None    # Set by move decode
                             # to facilitate debugging
+        self.check_pin_infos = {}   # by side, (piece key, CheckPinInfo)
+                                    # for latest position asked
                             
     def assert_sqs(self, sqs, sq_only=None,
                    sq_in=None, sq_out=None, desc=None):
@@ -121,35 +145,33 @@ class ChessPieceMovement:
             SlTrace.lg(f"Original sq:{orig_sq} is empty"
                        f" - not an actual game move")
             return False
-        ck_board = self.board.copy()   # compromise from playing with
-                                        # original board
-        ck_board.place_piece(move_piece, dest_sq)
-        if ck_board.poss_en_passant == dest_sq:
-            ck_board.clear_sq(
-                    ck_board.poss_en_passant_rm_sq)        
-        ck_board.clear_sq(orig_sq)
-        kpiece = self.piece_to_king(move_piece)
-        king_pss = self.get_pieces(piece=kpiece, board=ck_board)
-        if len(king_pss) == 0:
-            SlTrace.lg(f"No king for piece: {move_piece}", "trace_no_king")
-            return False    # Our king is not on board
-        
-        if len(king_pss) > 1:
-            SlTrace.lg(f"Too many kings for piece: {move_piece} : {king_pss}")
+        # Make the move in place, check, then restore the board
+        board = self.board
+        board.make_trial_move(orig_sq, dest_sq)
+        try:
+            kpiece = self.piece_to_king(move_piece)
+            king_sqs = board.get_piece_sqs(kpiece)
+            if len(king_sqs) == 0:
+                SlTrace.lg(f"No king for piece: {move_piece}", "trace_no_king")
+                return False    # Our king is not on board
+            
+            if len(king_sqs) > 1:
+                SlTrace.lg(f"Too many kings for piece: {move_piece} : {list(king_sqs)}")
+                return False
+            
+            king_sq = next(iter(king_sqs))
+    
+            if self.is_attacked(move_piece, king_sq):
+                return True         # King would be attacked
+            
             return False
         
-        king_ps = king_pss[0]
-        king_sq = self.ps_to_sq(king_ps)
-
-        
-        if self.is_attacked(move_piece, king_sq, board=ck_board):
-            return True         # King would be attacked
-        
-        return False
+        finally:
+            board.unmake_trial_move()
 
 
     def get_move_to_sqs(self, piece, orig_sq=None,
-                        add_piece=False):
+                        add_piece=False, ck_for_check=True):
         """ Get list of squares this piece can legaly move to
         including capture and promotion, based on board contents
         
@@ -169,6 +191,9 @@ class ChessPieceMovement:
         :add_piece: True if add piece to board (Deprecated)
                     mostly for testing
                     default: False
+        :ck_for_check: True - discard moves which would
+                        leave our king in check
+                    default: True
         :returns: dictionary of candidate destination squares
                 Empty if none
                 None if error
@@ -188,8 +213,16 @@ class ChessPieceMovement:
             piece, orig_sq=orig_sq,
             rep=rep)
         
+        if not ck_for_check:
+            return move_to_sqs_base
+        
         # Avoid leaving king in check
         # or king passing through check via castling
+        if self.get_piece(orig_sq) == piece:
+            return self.get_legal_sqs(piece, orig_sq, move_to_sqs_base,
+                        self.get_check_pin_info(self.piece_to_move(piece)))
+        
+        # Piece not on board - try each move
         move_to_sqs = {}
         for sq in move_to_sqs_base:
             if not self.leave_king_in_ckeck(dest_sq=sq,
@@ -197,6 +230,275 @@ class ChessPieceMovement:
                 move_to_sqs[sq] = self.get_piece(sq)
         return move_to_sqs
 
+    def get_check_pin_info(self, side):
+        """ Find, once for the position, what limits the side's
+        non-king moves: pieces giving check, the squares which
+        capture or block a single check, and pinned pieces with
+        the rays they may move along
+        Kept, by side, for the latest position (piece part of
+        the Zobrist key) as each piece's moves are asked for in turn
+        :side: white/black
+        :returns: CheckPinInfo, None if side has no king
+                    (or more than one) - no limit
+        """
+        key = self.board.zobrist_piece_key
+        entry = self.check_pin_infos.get(side)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        
+        info = self.make_check_pin_info(side)
+        self.check_pin_infos[side] = (key, info)
+        return info
+
+    def make_check_pin_info(self, side):
+        """ Compute check/pin information (see get_check_pin_info)
+        :side: white/black
+        :returns: CheckPinInfo, None if no single king
+        """
+        board = self.board
+        king = 'K' if side == "white" else 'k'
+        king_sqs = board.get_piece_sqs(king)
+        if len(king_sqs) != 1:
+            return None
+        
+        king_sq = next(iter(king_sqs))
+        mailbox = board.mailbox
+        index_sq = mailbox.index_sq
+        tables = board.attack_tables
+        mb_setting = board.mb_setting
+        king_index = mailbox.sq_index[king_sq]
+        is_white = side == "white"
+        if is_white:
+            knight, pawn, opp_king, rook, bishop, queen = "npkrbq"
+            pawn_from_sqs = tables.pawn_from_sqs["black"][king_index]
+        else:
+            knight, pawn, opp_king, rook, bishop, queen = "NPKRBQ"
+            pawn_from_sqs = tables.pawn_from_sqs["white"][king_index]
+        checkers = []           # checking pieces' indexes
+        block_indexes = []      # squares between king and slider checker
+        for i in tables.knight_sqs[king_index]:
+            if mb_setting[i] == knight:
+                checkers.append(i)
+        for i in pawn_from_sqs:
+            if mb_setting[i] == pawn:
+                checkers.append(i)
+        for i in tables.king_sqs[king_index]:
+            if mb_setting[i] == opp_king:
+                checkers.append(i)
+        pins = {}
+        for rays, slider in ((tables.rook_rays[king_index], rook),
+                             (tables.bishop_rays[king_index], bishop)):
+            for ray in rays:
+                our_index = None        # first of our pieces on ray
+                for n, i in enumerate(ray):
+                    ray_piece = mb_setting[i]
+                    if ray_piece is None:
+                        continue
+                    
+                    if ray_piece.isupper() == is_white:
+                        if our_index is not None:
+                            break       # Two of ours - no pin
+                        our_index = i
+                        continue
+                    
+                    if ray_piece == slider or ray_piece == queen:
+                        if our_index is None:
+                            checkers.append(i)
+                            block_indexes.extend(ray[:n])
+                        else:
+                            pins[index_sq[our_index]] = {
+                                index_sq[j] for j in ray[:n+1]}
+                    break       # opponent piece ends ray
+        
+        if len(checkers) == 0:
+            check_mask = None
+        elif len(checkers) == 1:
+            check_mask = {index_sq[i] for i in checkers + block_indexes}
+        else:
+            check_mask = set()  # Double check - only king can move
+        return CheckPinInfo(king_sq=king_sq,
+                            checkers=[index_sq[i] for i in checkers],
+                            check_mask=check_mask, pins=pins)
+
+    def get_legal_sqs(self, piece, orig_sq, move_to_sqs_base, info):
+        """ Remove moves leaving our king in check using the
+        position's CheckPinInfo.  King moves and en passant
+        captures are tried on the board (make/unmake) instead.
+        Same results as testing each move with leave_king_in_ckeck
+        :piece: our piece, on orig_sq
+        :orig_sq: origin square
+        :move_to_sqs_base: dictionary, by dest sq, of pre-move contents
+        :info: CheckPinInfo for piece's side, None - no limit
+        :returns: dictionary, by dest sq, of pre-move contents
+        """
+        if info is None:
+            return move_to_sqs_base
+        
+        piece_type = piece.lower()
+        ep_sq = self.board.poss_en_passant
+        check_mask = info.check_mask
+        pin_sqs = info.pins.get(orig_sq)
+        move_to_sqs = {}
+        for dest_sq, dest_piece in move_to_sqs_base.items():
+            if dest_piece is not None and (dest_piece == 'k'
+                                           or dest_piece == 'K'):
+                move_to_sqs[dest_sq] = dest_piece   # as leave_king_in_ckeck
+                continue
+            
+            if piece_type == 'k' or (piece_type == 'p'
+                                     and dest_sq == ep_sq):
+                if not self.leave_king_in_ckeck(dest_sq=dest_sq,
+                                                orig_sq=orig_sq):
+                    move_to_sqs[dest_sq] = dest_piece
+                continue
+            
+            if check_mask is not None and dest_sq not in check_mask:
+                continue        # Doesn't capture or block checker
+            
+            if pin_sqs is not None and dest_sq not in pin_sqs:
+                continue        # Leaves pin ray
+            
+            move_to_sqs[dest_sq] = dest_piece
+        return move_to_sqs
+
+    def get_orig_sqs(self, piece, dest_sq):
+        """ Find squares from which piece can move to dest_sq,
+        working back from dest_sq (ChessAttackTables), rather
+        than generating each of our pieces' moves
+        Same origins as get_move_sqs_base, king safety is not
+        checked (see get_legal_orig_sqs)
+        :piece: piece e.g. N, p
+        :dest_sq: destination square
+        :returns: list of origin squares
+        """
+        board = self.board
+        mailbox = board.mailbox
+        index_sq = mailbox.index_sq
+        mb_setting = board.mb_setting
+        dest_index = mailbox.sq_index[dest_sq]
+        dest_piece = mb_setting[dest_index]
+        is_white = piece.isupper()
+        if dest_piece is not None and dest_piece.isupper() == is_white:
+            return []       # Can't land on our own piece
+
+        tables = board.attack_tables
+        piece_type = piece.lower()
+        if piece_type == 'p':
+            orig_sqs = []
+            if dest_piece is not None or dest_sq == board.poss_en_passant:
+                color = "white" if is_white else "black"
+                for i in tables.pawn_from_sqs[color][dest_index]:
+                    if mb_setting[i] == piece:
+                        orig_sqs.append(index_sq[i])
+            if dest_piece is None:
+                back = -mailbox.width if is_white else mailbox.width
+                index = dest_index + back
+                if mb_setting[index] == piece:
+                    orig_sqs.append(index_sq[index])
+                elif mb_setting[index] is None:     # empty, on board
+                    index += back
+                    if (mb_setting[index] == piece
+                            and self.pawn_is_at_origin(piece,
+                                                       index_sq[index])):
+                        orig_sqs.append(index_sq[index])
+            return orig_sqs
+
+        orig_sqs = [index_sq[i] for i in
+                    tables.get_from_indexes(mb_setting, dest_index, piece)]
+        if piece_type == 'k' and not orig_sqs:
+            for king_sq in board.get_piece_sqs(piece):  # castling
+                for kingside in (True, False):
+                    castle_info = self.castle_info(piece, king_sq,
+                                        kingside=kingside,
+                                        ck_for_check=True)
+                    if castle_info.can_castle and castle_info.dest_sq == dest_sq:
+                        orig_sqs.append(king_sq)
+        return orig_sqs
+
+    def get_legal_orig_sqs(self, piece, dest_sq, orig_sqs=None):
+        """ Keep origin squares from which piece's move to dest_sq
+        doesn't leave our king in check
+        :piece: piece e.g. N, p
+        :dest_sq: destination square
+        :orig_sqs: candidate origins default: get_orig_sqs
+        :returns: list of origin squares
+        """
+        if orig_sqs is None:
+            orig_sqs = self.get_orig_sqs(piece, dest_sq)
+        if not orig_sqs:
+            return []
+
+        info = self.get_check_pin_info(self.piece_to_move(piece))
+        move_to_sqs_base = {dest_sq : self.get_piece(dest_sq)}
+        return [orig_sq for orig_sq in orig_sqs
+                if self.get_legal_sqs(piece, orig_sq, move_to_sqs_base, info)]
+
+    def generate_legal_moves(self, side):
+        """ Generate all legal moves for side in one pass
+        Checks and pins are found once for the position
+        :side: white/black
+        :returns: list of ChessLegalMove
+                pawn promotion has one move for each of Q,R,B,N
+        """
+        board = self.board
+        info = self.get_check_pin_info(side)
+        last_rank = str(board.nsqy) if side == "white" else "1"
+        promotions = "QRBN" if side == "white" else "qrbn"
+        ep_sq = board.poss_en_passant
+        moves = []
+        for ps in board.get_side_pieces(to_move=side):
+            piece, orig_sq = self.ps_to_p_sq(ps)
+            piece_type = piece.lower()
+            rep = 1 if piece_type == 'k' or piece_type == 'n' else None
+            move_to_sqs = self.get_legal_sqs(piece, orig_sq,
+                                self.get_move_sqs_base(piece, orig_sq,
+                                                       rep=rep),
+                                info)
+            for dest_sq, dest_piece in move_to_sqs.items():
+                if piece_type == 'p':
+                    if dest_sq == ep_sq and dest_piece is None and dest_sq[0] != orig_sq[0]:
+                        capture_sq = dest_sq[0] + orig_sq[1:]
+                        moves.append(ChessLegalMove(piece, orig_sq, dest_sq,
+                                    captured=board.get_piece(capture_sq),
+                                    capture_sq=capture_sq,
+                                    is_en_passant=True))
+                    elif dest_sq[1:] == last_rank:
+                        for promoted_piece in promotions:
+                            moves.append(ChessLegalMove(piece, orig_sq, dest_sq,
+                                    captured=dest_piece,
+                                    capture_sq=None if dest_piece is None else dest_sq,
+                                    promoted_piece=promoted_piece))
+                    else:
+                        moves.append(ChessLegalMove(piece, orig_sq, dest_sq,
+                                    captured=dest_piece,
+                                    capture_sq=None if dest_piece is None else dest_sq))
+                    continue
+                
+                if piece_type == 'k':
+                    o_file, o_rank = self.sq_to_file_rank(orig_sq, to_int=True)
+                    d_file, d_rank = self.sq_to_file_rank(dest_sq, to_int=True)
+                    if abs(d_file - o_file) == 2:
+                        if d_file > o_file:
+                            rook_orig_sq = self.file_rank_to_sq(
+                                        file=board.nsqx, rank=o_rank)
+                            rook_dest_sq = self.file_rank_to_sq(
+                                        file=d_file-1, rank=o_rank)
+                        else:
+                            rook_orig_sq = self.file_rank_to_sq(
+                                        file=1, rank=o_rank)
+                            rook_dest_sq = self.file_rank_to_sq(
+                                        file=d_file+1, rank=o_rank)
+                        moves.append(ChessLegalMove(piece, orig_sq, dest_sq,
+                                    is_castle=True,
+                                    rook_orig_sq=rook_orig_sq,
+                                    rook_dest_sq=rook_dest_sq))
+                        continue
+                    
+                moves.append(ChessLegalMove(piece, orig_sq, dest_sq,
+                            captured=dest_piece,
+                            capture_sq=None if dest_piece is None else dest_sq))
+        return moves
+
     def square_discard_on_check(self,
                                 orig_sq=None,
                                 dest_sq=None,
@@ -245,6 +547,10 @@ class ChessPieceMovement:
         :dir: direction (x_inc,y_inc) or (x_inc,y_inc,special)
         :returns: adjacent square, None if off board
         """
+        if (self.board.engine == "mailbox"
+                and -2 <= dir[0] <= 2 and -2 <= dir[1] <= 2):
+            return self.board.mailbox.adj_sq(sq, dir)
+        
         file_no, rank_no = self.sq_to_file_rank(sq, to_int=True)
         file_inc, rank_inc = dir[0],dir[1]
         file_no += file_inc   
@@ -273,6 +579,9 @@ class ChessPieceMovement:
         :returns: dictionary, by dest sq, of pre-move contents
                     
         """
+        if self.board.bitboards is not None:
+            return self.board.bitboards.get_move_sqs_base(piece, orig_sq)
+        
         if piece == 'p' or piece == 'P':
             return self.get_move_pawn_dir_sqs(piece, orig_sq)
         
@@ -283,26 +592,29 @@ class ChessPieceMovement:
         move_sqs_castle = {}    # Dictionary, by dest_sq, of castle info
         
         piece_type = self.piece_to_type(piece)
-        our_color = self.piece_color(piece)
-        list_dirs = self.piece_type_dir_d[piece_type]
-        for dir in list_dirs:
-            sq = orig_sq
-            for i in range(rep):
-                sq = self.get_adj_sq(sq, dir)
-                if sq is None:
-                    break   # over board edge
-                sq_piece = self.get_piece(sq)                    
-                if sq_piece is None:
-                    sqs_d[sq] = sq_piece    # save empty    
-                    continue
-                
-                # Square is occupied                
-                sq_piece_color = self.piece_color(sq_piece)
-                if sq_piece_color == our_color:
-                    break   # End, Not a capture situation
-                
-                sqs_d[sq] = sq_piece
-                break       # End if capturing piece
+        if self.board.engine == "mailbox":
+            self.get_move_dir_sqs_mailbox(piece, orig_sq, rep, sqs_d)
+        else:
+            our_color = self.piece_color(piece)
+            list_dirs = self.piece_type_dir_d[piece_type]
+            for dir in list_dirs:
+                sq = orig_sq
+                for i in range(rep):
+                    sq = self.get_adj_sq(sq, dir)
+                    if sq is None:
+                        break   # over board edge
+                    sq_piece = self.get_piece(sq)                    
+                    if sq_piece is None:
+                        sqs_d[sq] = sq_piece    # save empty    
+                        continue
+                    
+                    # Square is occupied                
+                    sq_piece_color = self.piece_color(sq_piece)
+                    if sq_piece_color == our_color:
+                        break   # End, Not a capture situation
+                    
+                    sqs_d[sq] = sq_piece
+                    break       # End if capturing piece
 
         """
         Check for castling options
@@ -331,6 +643,35 @@ class ChessPieceMovement:
                 
         return sqs_d
 
+    def get_move_dir_sqs_mailbox(self, piece, orig_sq, rep, sqs_d):
+        """ Mailbox version of the non-pawn direction stepping
+        in get_move_sqs_base - integer offsets instead of
+        square string conversions
+        :piece: our piece
+        :orig_sq: original square
+        :rep: maximum repetition
+        :sqs_d: dictionary, by dest sq, of pre-move contents
+                added to
+        """
+        mailbox = self.board.mailbox
+        mb_setting = self.board.mb_setting
+        index_sq = mailbox.index_sq
+        off_board = mailbox.OFF_BOARD
+        is_white = piece.isupper()
+        orig_index = mailbox.sq_index[orig_sq]
+        for offset in mailbox.piece_type_offsets[piece.lower()]:
+            index = orig_index
+            for i in range(rep):
+                index += offset
+                sq_piece = mb_setting[index]
+                if sq_piece is None:
+                    sqs_d[index_sq[index]] = None   # save empty
+                    continue
+                
+                if sq_piece is not off_board and sq_piece.isupper() != is_white:
+                    sqs_d[index_sq[index]] = sq_piece   # capture
+                break   # over board edge, our piece, or capture
+            
     pawn_dirs = {
         #       rep: first move 1, else 2
         "P" : [(0,1,"move"),
@@ -349,6 +690,9 @@ class ChessPieceMovement:
         :orig_sq: our square
         :returns: dictionary, by sq, of moveable squares
         """
+        if self.board.engine == "mailbox":
+            return self.get_move_pawn_dir_sqs_mailbox(piece, orig_sq)
+        
         sqs_d = {}
         piece_type = self.piece_to_type(piece)
         our_color = self.piece_color(piece)
@@ -388,6 +732,43 @@ class ChessPieceMovement:
                         break   # blocked by any piece
         return sqs_d
 
+    def get_move_pawn_dir_sqs_mailbox(self, piece, orig_sq):
+        """ Mailbox version of get_move_pawn_dir_sqs
+        :piece: our piece   "P" - WHITE, "p" -black
+        :orig_sq: our square
+        :returns: dictionary, by sq, of moveable squares
+        """
+        sqs_d = {}
+        board = self.board
+        mailbox = board.mailbox
+        mb_setting = board.mb_setting
+        index_sq = mailbox.index_sq
+        is_white = piece == "P"
+        forward = mailbox.width if is_white else -mailbox.width
+        orig_index = mailbox.sq_index[orig_sq]
+        
+        index = orig_index
+        rep = 2 if self.pawn_is_at_origin(piece, orig_sq) else 1
+        for i in range(rep):
+            index += forward
+            if mb_setting[index] is not None:
+                break   # blocked by any piece or board edge
+            sqs_d[index_sq[index]] = None
+            
+        for index in (orig_index+forward-1, orig_index+forward+1):
+            sq = index_sq[index]
+            if sq is None:
+                continue    # over board edge
+            
+            if board.poss_en_passant == sq:
+                sqs_d[sq] = None    # en passant
+                continue
+            
+            sq_piece = mb_setting[index]
+            if sq_piece is not None and sq_piece.isupper() != is_white:
+                sqs_d[sq] = sq_piece
+        return sqs_d
+
     def castle_orig_dest_sq(self, piece, kingside=True):
         """ Returns castle destination square
         Assumes valid checks already passed
@@ -443,6 +824,10 @@ class ChessPieceMovement:
                 default: True  - check
         :returns: castling info (CastleInfo)
         """
+        if self.board.bitboards is not None:
+            return self.board.bitboards.castle_info(piece, orig_sq,
+                            kingside=kingside, ck_for_check=ck_for_check)
+        
         no_castle = CastleInfo(can_castle=False)    # not casle value
         piece_type = self.piece_to_type(piece)
         to_move = self.piece_to_move(piece)
@@ -699,32 +1084,7 @@ class ChessPieceMovement:
         :returns: dictionary by squares, of pieces which can attack our
                 square sq
         """
-        if len(ps) > 2:
-            target_piece,target_sq = self.ps_to_p_sq(ps)
-            to_move = self.piece_to_move(target_piece)
-        else:
-            target_piece = None
-            target_sq = ps
-            
-        if to_move is None:
-            to_move = self.get_to_move()
-        
-        target_piece_type = self.piece_to_type(target_piece)
-        att_pcs = self.att_pieces_black if to_move == "white" else self.att_pieces_white
-        att_piece_sqs = self.get_pieces(att_pcs)   
-        attacking_psq = {}
-        
-        # If target is king, attackers need not worry about
-        # going into check
-        ck_for_check = False if target_piece_type=='k' else True
-        for att_psq in att_piece_sqs:
-            att_piece, att_sq = self.ps_to_p_sq(att_psq)
-            att_move_to_sqs = self.get_move_to_sqs(att_piece,
-                                        orig_sq=att_sq,
-                                        ck_for_check=ck_for_check)
-            if target_sq in att_move_to_sqs:
-                attacking_psq[att_sq] = att_piece 
-        return attacking_psq
+        return self.board.get_attacking_pieces(ps, to_move=to_move)
     
     def is_attacked(self, piece, sq, board=None):
         """ Check if piece is attacked (by an opponent)
@@ -735,6 +1095,14 @@ class ChessPieceMovement:
         """
         if board is None:
             board = self.board
+        if board.bitboards is not None:
+            return board.bitboards.is_attacked(piece, sq)
+        
+        if board.engine == "mailbox":
+            return board.attack_tables.is_attacked(board.mb_setting,
+                            board.mailbox.sq_index[sq],
+                            by_white=not piece.isupper())
+        
         to_move = self.piece_to_move(piece)
         opp_pieces = self.get_opponent_pieces(to_move, board=board)
         for ps in opp_pieces:
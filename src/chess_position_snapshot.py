@@ -0,0 +1,194 @@
+#chess_position_snapshot.py 18Oct2026  crs, Author
+"""
+Immutable, compact chess position
+    board   bytes, one per square, rank 1 first, file a first
+            piece letter as in FEN (KQRBNPkqrbnp), "." if empty
+            (64 bytes for the 8x8 board)
+    state   int, packed:
+            bit 0       black to move
+            bits 1-4    castling rights: white kingside, white queenside,
+                        black kingside, black queenside
+            bits 5-9    en passant file (1-), 0 if none
+            bits 10-25  half move clock
+            bits 26-    full move clock
+About 100 bytes each, against a full Chessboard with its
+ChessPieceMovement and move stacks, so stacks and caches can
+hold thousands.  Snapshots are hashable and compare by value
+so they can be used as dictionary keys.
+Move history (moved pieces, save units) is not kept - castling
+rights carry what legality needs.
+"""
+import sys
+
+from chess_error import ChessError
+from chess_mailbox import ChessMailbox
+
+class PositionSnapshot:
+    __slots__ = ("board", "state", "nsqx")
+
+    EMPTY = ord(".")
+    BLACK_TO_MOVE = 1
+    CASTLE_BITS = (
+        ("can_castle_white_kingside", 1 << 1),
+        ("can_castle_white_queenside", 1 << 2),
+        ("can_castle_black_kingside", 1 << 3),
+        ("can_castle_black_queenside", 1 << 4),
+        )
+    EP_SHIFT = 5
+    EP_MASK = 0x1f
+    HALF_MOVE_SHIFT = 10
+    HALF_MOVE_MASK = 0xffff
+    FULL_MOVE_SHIFT = 26
+
+    sq_indexes_by_size = {}     # mailbox indexes, in board bytes order
+                                # by (nsqx,nsqy)
+
+    @classmethod
+    def get_sq_indexes(cls, nsqx, nsqy):
+        """ Get mailbox indexes in board bytes order
+        :nsqx: number of files
+        :nsqy: number of ranks
+        :returns: list of mailbox indexes
+        """
+        size = (nsqx, nsqy)
+        if size not in cls.sq_indexes_by_size:
+            mailbox = ChessMailbox.get_mailbox(nsqx, nsqy)
+            cls.sq_indexes_by_size[size] = [
+                mailbox.file_rank_to_index(file, rank)
+                for rank in range(1, nsqy+1)
+                for file in range(1, nsqx+1)]
+        return cls.sq_indexes_by_size[size]
+
+    @classmethod
+    def from_board(cls, board):
+        """ Take snapshot of board position
+        :board: Chessboard
+        :returns: PositionSnapshot
+        """
+        mb_setting = board.mb_setting
+        board_bytes = bytes(cls.EMPTY if mb_setting[i] is None
+                            else ord(mb_setting[i])
+                            for i in cls.get_sq_indexes(board.nsqx,
+                                                        board.nsqy))
+        state = cls.BLACK_TO_MOVE if board.to_move == "black" else 0
+        for attr, bit in cls.CASTLE_BITS:
+            if getattr(board, attr):
+                state |= bit
+        if board.poss_en_passant is not None:
+            ep_file = ord(board.poss_en_passant[0]) - ord('a') + 1
+            state |= ep_file << cls.EP_SHIFT
+        state |= (board.half_move_clock & cls.HALF_MOVE_MASK) << cls.HALF_MOVE_SHIFT
+        state |= board.full_move_clock << cls.FULL_MOVE_SHIFT
+        return cls(board_bytes, state, nsqx=board.nsqx)
+
+    def __init__(self, board, state, nsqx=8):
+        """ Setup snapshot - see from_board
+        :board: bytes, one per square
+        :state: packed state int
+        :nsqx: number of files default: 8
+        """
+        object.__setattr__(self, "board", board)
+        object.__setattr__(self, "state", state)
+        object.__setattr__(self, "nsqx", nsqx)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PositionSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("PositionSnapshot is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, PositionSnapshot):
+            return NotImplemented
+        return self.state == other.state and self.board == other.board
+
+    def __hash__(self):
+        return hash((self.board, self.state))
+
+    def __reduce__(self):
+        return (PositionSnapshot, (self.board, self.state, self.nsqx))
+
+    def __repr__(self):
+        return f"PositionSnapshot({self.board.decode('ascii')} {self.state:#x})"
+
+    def nbytes(self):
+        """ Approximate memory used
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self.board)
+
+    def get_nsqy(self):
+        """ Number of ranks
+        """
+        return len(self.board)//self.nsqx
+
+    def get_to_move(self):
+        """ Side to move
+        :returns: white/black
+        """
+        return "black" if self.state & self.BLACK_TO_MOVE else "white"
+
+    def get_en_passant_sq(self):
+        """ En passant square
+        :returns: square, None if none
+        """
+        ep_file = (self.state >> self.EP_SHIFT) & self.EP_MASK
+        if ep_file == 0:
+            return None
+
+        ep_rank = self.get_nsqy()-2 if self.get_to_move() == "white" else 3
+        return chr(ord('a')+ep_file-1) + str(ep_rank)
+
+    def load_into(self, board):
+        """ Set board to snapshot's position
+        Board's move history is not changed
+        :board: Chessboard, of the same size
+        """
+        nsqy = self.get_nsqy()
+        if board.nsqx != self.nsqx or board.nsqy != nsqy:
+            raise ChessError(f"snapshot {self.nsqx}x{nsqy} does not fit"
+                             f" board {board.nsqx}x{board.nsqy}")
+        board.clear_board()
+        index_sq = board.mailbox.index_sq
+        empty = self.EMPTY
+        for index, code in zip(self.get_sq_indexes(self.nsqx, nsqy),
+                               self.board):
+            if code != empty:
+                board.set_sq(index_sq[index], chr(code))
+        state = self.state
+        board.to_move = self.get_to_move()
+        for attr, bit in self.CASTLE_BITS:
+            setattr(board, attr, (state & bit) != 0)
+        board.half_move_clock = (state >> self.HALF_MOVE_SHIFT) & self.HALF_MOVE_MASK
+        board.full_move_clock = state >> self.FULL_MOVE_SHIFT
+        board.poss_en_passant = ep_sq = self.get_en_passant_sq()
+        if ep_sq is not None:
+            # The pawn which just passed the en passant square
+            pawn_rank = int(ep_sq[1:]) + (1 if board.to_move == "white" else -1)
+            board.poss_en_passant_rm_sq = ep_sq[0] + str(pawn_rank)
+
+    def to_board(self, engine="mailbox"):
+        """ Make board with snapshot's position
+        :engine: Chessboard engine default: "mailbox"
+        :returns: new Chessboard
+        """
+        from chessboard import Chessboard   # chessboard imports us
+
+        board = Chessboard(nsqx=self.nsqx, nsqy=self.get_nsqy(),
+                           standard_setup=False, engine=engine)
+        self.load_into(board)
+        return board
+
+
+if __name__ == "__main__":
+    from chessboard import Chessboard
+
+    cb = Chessboard(pieces="FEN:r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 0 12")
+    snap = PositionSnapshot.from_board(cb)
+    print(snap)
+    print(f"snapshot size: {snap.nbytes()} bytes")
+    cb2 = snap.to_board()
+    assert cb2.board_to_fen_str() == cb.board_to_fen_str()
+    assert cb2.get_zobrist_key() == cb.get_zobrist_key()
+    assert PositionSnapshot.from_board(cb2) == snap
+    assert {snap: 1}[PositionSnapshot.from_board(cb2)] == 1
+    print(cb2.board_to_fen_str())
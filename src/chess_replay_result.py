@@ -0,0 +1,35 @@
+#chess_replay_result.py 18Oct2026  crs, Author
+"""
+Outcome of Chessboard.replay_game
+"""
+
+class ChessReplayResult:
+    __slots__ = ("nply", "fen", "fens", "keys", "ucis",
+                 "err", "err_index", "game_result")
+
+    def __init__(self, fens=None, keys=None, ucis=None):
+        """ Setup empty result
+        :fens: list to fill with FEN by ply, None - not kept
+        :keys: list to fill with Zobrist key by ply, None - not kept
+        :ucis: list to fill with moves made (UCI), None - not kept
+        """
+        self.nply = 0               # Half moves made
+        self.fen = None             # Final position FEN
+        self.fens = fens            # [0] start, [n] after nth ply
+        self.keys = keys            # as fens
+        self.ucis = ucis            # [n] nth ply e.g. e2e4
+        self.err = None             # First error, None if none
+        self.err_index = None       # moves index of error
+        self.game_result = None     # Game result, if reached
+
+    def is_ok(self):
+        """ True if replay had no error
+        """
+        return self.err is None
+
+    def __repr__(self):
+        if self.err is not None:
+            return (f"ChessReplayResult({self.nply} plies,"
+                    f" error at {self.err_index}: {self.err})")
+        return (f"ChessReplayResult({self.nply} plies {self.fen}"
+                f" result: {self.game_result})")
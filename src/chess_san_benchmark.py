@@ -0,0 +1,133 @@
+#chess_san_benchmark.py 18Oct2026  crs, Author
+"""
+Move specification (SAN) splitting - correctness and speed
+Splits every move of every game in the PGN files with the single
+compiled expression (SanParts.parse) and with the cascade of
+re.match calls ChessMoveNotation.decode_spec_parts used before,
+reports moves/sec for each and any move where the two differ.
+Only the splitting is timed, not the board work after it.
+
+Usage: python chess_san_benchmark.py [-g games_dir] [-r repeat]
+"""
+import os
+import re
+import time
+import argparse
+
+from graphics_braille.select_trace import SlTrace
+
+import pgn
+from chess_san_parts import SanParts
+
+def cascade_parts(spec):
+    """ Split spec the previous way, one re.match per part
+    :spec: move specification
+    :returns: SanParts, None if no active piece found
+    """
+    parts = SanParts(spec)
+    spec_rem = spec
+    if (match_res := re.match(r'(.*)\s*(([0-1]-[0-1])|(1/2-1/2)|\*)\s*$', spec_rem)):
+        mr_list = list(match_res.groups())
+        spec_rem = mr_list[0]
+        parts.result = mr_list[1]
+        if spec_rem == "":
+            return parts
+
+    if (match_res := re.match(r'(.*)\s*([+#])\s*$', spec_rem)):
+        spec_rem, parts.check = match_res.groups()
+    parts.base = spec_rem
+    if (match_castle := re.match(r'(O-O|O-O-O)$', spec_rem)):
+        parts.castle = match_castle.group(1)
+        return parts
+
+    if (match_promote := re.match(r'(.*)=([A-Z])$', spec_rem)):
+        spec_rem, parts.promoted = match_promote.groups()
+    if (match_res := re.match(r'(.*)([a-w]\d+)$', spec_rem)):
+        spec_rem, parts.dest_sq = match_res.groups()
+    elif (match_res := re.match(r'(.*)([a-w])$', spec_rem)):
+        spec_rem, parts.dest_file = match_res.groups()
+    if (match_res := re.match(r'(.*)([x:])$', spec_rem)):
+        spec_rem = match_res.group(1)
+        parts.capture = True
+    if (match_res := re.match(r'([A-Z])(.*)$', spec_rem)):
+        parts.piece, choice = match_res.groups()
+    elif (match_res := re.match(r'([a-w])(.*)$', spec_rem)):
+        parts.from_file, choice = match_res.groups()
+    elif spec_rem == "":
+        choice = ""
+    else:
+        return None
+
+    # Choice as SanParts holds it
+    if (match_res := re.match(r'([a-w])?(\d+)?$', choice)):
+        file, parts.from_rank = match_res.groups()
+        if file is not None:
+            parts.from_file = file
+    else:
+        return None
+    return parts
+
+def get_specs(games_dir):
+    """ Get move specifications of all games in directory
+    :games_dir: directory of .pgn files
+    :returns: list of specs
+    """
+    specs = []
+    for name in sorted(os.listdir(games_dir)):
+        if not name.endswith(".pgn"):
+            continue
+        with open(os.path.join(games_dir, name)) as game_file:
+            for game in pgn.loads(game_file.read()):
+                specs.extend(game.moves)
+    return specs
+
+def time_parser(name, parse, specs, repeat=1):
+    """ Time a parser over specs
+    :name: parser name, for report
+    :parse: parse(spec)
+    :specs: move specifications
+    :repeat: times over specs
+    :returns: list of results, from the last pass
+    """
+    time_start = time.time()
+    for _ in range(repeat):
+        results = [parse(spec) for spec in specs]
+    dur = time.time() - time_start
+    nspec = len(specs)*repeat
+    SlTrace.lg(f"{name:8} {nspec:8} moves {dur:7.3f} sec"
+               f" {nspec/dur if dur > 0 else 0:10.0f} moves/sec")
+    return results
+
+
+if __name__ == "__main__":
+    games_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "games")
+    repeat = 3
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-g', '--games_dir', default=games_dir,
+                        help=f"PGN games directory (default:{games_dir})")
+    parser.add_argument('-r', '--repeat', type=int, default=repeat,
+                        help=f"Passes over the moves (default:{repeat})")
+    args = parser.parse_args()             # or die "Illegal options"
+
+    SlTrace.clearFlags()
+    specs = get_specs(args.games_dir)
+    SlTrace.lg(f"{len(specs)} moves, {len(set(specs))} different"
+               f" in {args.games_dir}")
+    cascade_results = time_parser("cascade", cascade_parts, specs,
+                                  repeat=args.repeat)
+    san_results = time_parser("SanParts", SanParts.parse, specs,
+                              repeat=args.repeat)
+    ndiff = 0
+    for spec, cascade_res, san_res in zip(specs, cascade_results,
+                                          san_results):
+        if cascade_res != san_res:
+            ndiff += 1
+            if ndiff <= 10:
+                SlTrace.lg(f"    {spec!r}: cascade: {cascade_res}"
+                           f" SanParts: {san_res}")
+    if ndiff > 0:
+        SlTrace.lg(f"{ndiff} moves split differently")
+    else:
+        SlTrace.lg("NO DIFFERENCES")
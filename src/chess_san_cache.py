@@ -0,0 +1,115 @@
+#chess_san_cache.py 18Oct2026  crs, Author
+"""
+Bounded LRU cache of resolved move specifications
+Keyed by (position Zobrist key, spec) e.g. (key, "Nf3"), the value
+is the fully resolved move (ChessMove.RESOLVED_ATTRS values):
+origin, destination, promotion, castling rook squares...
+so a spec met again in the same position skips parsing and
+legality work (ChessMove.decode).
+
+Games in an archive repeat the same openings, so most of the
+early moves of a game are hits.  One cache is shared by all
+boards (ChessSanCache.get_default()).  Zobrist keys come from a
+fixed seed, so the cache may be saved and loaded between runs,
+as JSON.
+"""
+import os
+import json
+
+from graphics_braille.select_trace import SlTrace
+
+from chess_move_cache import ChessMoveCache
+from chess_move import ChessMove
+
+class ChessSanCache(ChessMoveCache):
+    DEFAULT_CAPACITY = 65536    # Number of (position, spec) entries
+    NAME = "SAN cache"
+    FILE_VERSION = 2            # Saved file format
+
+    default_cache = None        # Shared cache, see get_default
+
+    def save(self, file_name):
+        """ Save entries, least recently used first
+        :file_name: file to write
+        :returns: number of entries saved
+        """
+        with self.lock:
+            entries = list(self.entries.items())
+        with open(file_name, "w", encoding="utf-8") as cache_file:
+            json.dump({"version" : self.FILE_VERSION,
+                       "entries" : entries}, cache_file)
+        return len(entries)
+
+    def load(self, file_name):
+        """ Add entries from file saved by save
+        Anything not a well formed cache file is ignored
+        :file_name: file to read
+        :returns: number of entries loaded,
+                0 if no file or not a cache file
+        """
+        if not os.path.exists(file_name):
+            return 0
+
+        try:
+            with open(file_name, encoding="utf-8") as cache_file:
+                saved = json.load(cache_file)
+            if saved["version"] != self.FILE_VERSION:
+                return 0
+
+            entries = [((zobrist_key, spec), value)
+                       for (zobrist_key, spec), value in saved["entries"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            SlTrace.lg(f"{self.NAME} {file_name} ignored: {e}")
+            return 0
+
+        nattr = len(ChessMove.RESOLVED_ATTRS)
+        if not all(self.is_int(zobrist_key) and isinstance(spec, str)
+                   and isinstance(value, list) and len(value) == nattr
+                   and all(item is None or isinstance(item, (str, bool))
+                           for item in value)
+                   for (zobrist_key, spec), value in entries):
+            SlTrace.lg(f"{self.NAME} {file_name} ignored: bad form")
+            return 0
+
+        for key, value in entries:
+            self.put(key, tuple(value))
+        return len(entries)
+
+    @staticmethod
+    def is_int(value):
+        """ True if value is an int (not bool)
+        """
+        return isinstance(value, int) and not isinstance(value, bool)
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import pgn
+    from graphics_braille.select_trace import SlTrace
+    from chessboard import Chessboard
+    from chess_move import ChessMove
+
+    SlTrace.clearFlags()
+    game_file = sys.argv[1] if len(sys.argv) > 1 else "../games/Morphy.pgn"
+    with open(game_file) as f:
+        games = pgn.loads(f.read())[:100]
+
+    cache = Chessboard().san_cache  # chessboard's import of this module
+    for npass in range(2):
+        cache.clear_stats()
+        for game in games:
+            cb = Chessboard()
+            for spec in game.moves:
+                cm = ChessMove(cb)
+                cb.cm = cm
+                if cm.decode(spec) or cm.game_result is not None:
+                    break
+                cm.make_move()
+        SlTrace.lg(f"pass {npass+1}: {cache.stats_str()}")
+
+    file_name = os.path.join(tempfile.gettempdir(), "chess_san_cache.json")
+    nsaved = cache.save(file_name)
+    loaded = type(cache)()
+    SlTrace.lg(f"saved {nsaved}, loaded {loaded.load(file_name)}")
+    os.remove(file_name)
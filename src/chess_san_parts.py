@@ -0,0 +1,117 @@
+#chess_san_parts.py 18Oct2026  crs, Author
+"""
+Split a move specification (SAN e.g. Nbd7, exd5, e8=Q+, O-O-O,
+Rc2# 0-1) into its parts with one precompiled regular expression.
+The parts say only what was written, ChessMoveNotation works out
+the move from them on the board.
+
+As with ChessMoveNotation, files are a-w so "x" is never a file.
+"""
+import re
+
+class SanParts:
+    __slots__ = ("spec", "base", "castle", "piece", "from_file", "from_rank",
+                 "capture", "dest_sq", "dest_file", "promoted",
+                 "check", "result")
+
+    SAN_RE = re.compile(r"""
+        \s*
+        (?P<base>
+            (?P<castle>O-O-O|O-O)
+          |
+            (?P<piece>[A-Z])?           # none for pawn
+            (?P<from_file>[a-w])?       # disambiguation / pawn's file
+            (?P<from_rank>\d+)?
+            (?P<capture>[x:])?
+            (?:(?P<dest_sq>[a-w]\d+)|(?P<dest_file>[a-w]))
+            (?:=(?P<promoted>[A-Z]))?
+        )?
+        \s*
+        (?P<check>[+#])?
+        \s*
+        (?P<result>[0-1]-[0-1]|1/2-1/2|\*)?
+        \s*$
+        """, re.VERBOSE)
+
+    @classmethod
+    def parse(cls, spec):
+        """ Split move specification into parts
+        :spec: move specification
+        :returns: SanParts, None if not a move specification
+        """
+        match = cls.SAN_RE.match(spec)
+        if match is None:
+            return None
+
+        parts = cls(spec, *match.groups())  # groups in __init__ order
+        if parts.base is None and parts.result is None:
+            return None         # Nothing there
+
+        return parts
+
+    def __init__(self, spec, base=None, castle=None, piece=None,
+                 from_file=None, from_rank=None, capture=False,
+                 dest_sq=None, dest_file=None, promoted=None,
+                 check=None, result=None):
+        """ Setup parts - see parse
+        :spec: move specification
+        :base: movement part of spec, without check or result
+        :castle: "O-O", "O-O-O", None if not castling
+        :piece: piece letter as written, None for pawn
+        :from_file: origin file, if given
+        :from_rank: origin rank, if given
+        :capture: True (or "x", ":") if capture
+        :dest_sq: destination square e.g. d7
+        :dest_file: destination file, if only file given e.g. bxc
+        :promoted: promoted piece letter as written
+        :check: "+", "#", None
+        :result: game result e.g. 0-1, 1/2-1/2, *
+        """
+        self.spec = spec
+        self.base = base
+        self.castle = castle
+        self.piece = piece
+        self.from_file = from_file
+        self.from_rank = from_rank
+        self.capture = bool(capture)
+        self.dest_sq = dest_sq
+        self.dest_file = dest_file
+        self.promoted = promoted
+        self.check = check
+        self.result = result
+
+    def has_movement(self):
+        """ False for a game result alone
+        """
+        return (self.castle is not None or self.dest_sq is not None
+                or self.dest_file is not None)
+
+    def get_choice(self):
+        """ Disambiguation as written after the piece letter
+        e.g. "b" for Nbd7, "5" for R5a4, "h4" for Qh4e1
+        """
+        choice = ""
+        if self.piece is not None and self.from_file is not None:
+            choice += self.from_file
+        if self.from_rank is not None:
+            choice += self.from_rank
+        return choice
+
+    def __eq__(self, other):
+        if not isinstance(other, SanParts):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__[2:])
+
+    def __repr__(self):
+        parts = ", ".join(f"{name}={getattr(self, name)!r}"
+                          for name in self.__slots__[2:]
+                          if getattr(self, name) not in (None, False))
+        return f"SanParts({self.spec!r}: {parts})"
+
+
+if __name__ == "__main__":
+    for spec in ["e4", "Nf3", "exd5", "Nbd7", "R5a4+", "Qh4e1", "bxc",
+                 "e8=Q+", "O-O", "O-O-O#", "Rc2# 0-1", "1/2-1/2", "*",
+                 "a10", "Zz", ""]:
+        print(f"{spec!r:12} {SanParts.parse(spec)}")
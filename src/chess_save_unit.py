@@ -1,4 +1,5 @@
 #chess_save_unit.py
+import copy
 
 class ChessSaveUnit:
     """ Save info to support restoring previous current
@@ -77,6 +78,15 @@ class ChessSaveUnit:
             can_castle_black_queenside = board.can_castle_black_queenside
         self.can_castle_black_queenside = can_castle_black_queenside
 
+    def copy(self, board):
+        """ Copy save unit for a board copy
+        :board: board copy, to which restore applies
+        :returns: ChessSaveUnit
+        """
+        csu_new = copy.copy(self)
+        csu_new.board = board
+        return csu_new
+
     def get_move_no(self):
         """ Get move no as of save
         """
@@ -0,0 +1,178 @@
+#chess_timeline_worker.py 18Oct2026  crs, Author
+"""
+Build a game's timeline (ChessGameTimeline) on a worker thread
+so a display stays responsive while a long game is replayed.
+
+Results are reported through callbacks, each passed to
+call_after for delivery e.g. wx.CallAfter, so they run on the
+display's thread:
+    on_progress(worker, count)  every batch positions, and at the end
+                                positions 0..count-1 are ready
+    on_error(worker, index, err)   as soon as a move fails to decode
+    on_done(worker)             replay finished
+The default call_after calls directly, on the worker thread.
+Only the timeline's positions below the reported count are
+read by the callbacks' side, the rest are still being added.
+No display (wx) objects are used here.
+"""
+import threading
+
+from chess_game_timeline import ChessGameTimeline
+
+class ChessTimelineWorker:
+    DEFAULT_BATCH = 20      # Positions between progress reports
+
+    def __init__(self, timeline=None, game=None, moves=None, board=None,
+                 on_progress=None, on_error=None, on_done=None,
+                 call_after=None, batch=None):
+        """ Setup worker, started by start()
+        :timeline: ChessGameTimeline to build
+                default: made from game, moves, board
+        :game: PGN game
+        :moves: list of move specifications
+        :board: starting position default: standard
+        :on_progress: progress callback, see above
+        :on_error: first decode error callback
+        :on_done: replay finished callback
+        :call_after: call_after(fun, *args) delivers a callback
+                default: call directly
+        :batch: positions between progress reports
+                default: DEFAULT_BATCH
+        """
+        if timeline is None:
+            timeline = ChessGameTimeline(moves=moves, game=game, board=board)
+        self.timeline = timeline
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_done = on_done
+        if call_after is None:
+            call_after = self.call_direct
+        self.call_after = call_after
+        if batch is None:
+            batch = self.DEFAULT_BATCH
+        self.batch = batch
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def call_direct(fun, *args):
+        """ Default call_after - call now
+        """
+        fun(*args)
+
+    def start(self):
+        """ Start replay on worker thread
+        :returns: self, for chaining
+        """
+        self.thread = threading.Thread(target=self.run,
+                                       name="ChessTimelineWorker",
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """ Stop replay, dropping any callbacks not yet delivered
+        """
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def is_done(self):
+        """ True if replay has finished (or been cancelled)
+        """
+        return self.done_event.is_set()
+
+    def wait(self, timeout=None):
+        """ Wait for replay to finish
+        :timeout: maximum seconds to wait default: no limit
+        :returns: True if finished
+        """
+        return self.done_event.wait(timeout)
+
+    def report(self, callback, *args):
+        """ Pass callback to call_after, unless none or cancelled
+        """
+        if callback is None or self.is_cancelled():
+            return
+
+        self.call_after(self.deliver, callback, *args)
+
+    def deliver(self, callback, *args):
+        """ Run callback on the receiving side, unless cancelled
+        in the meantime
+        """
+        if self.is_cancelled():
+            return
+
+        callback(self, *args)
+
+    def run(self):
+        """ Replay timeline, reporting as we go
+        """
+        timeline = self.timeline
+        try:
+            reported = len(timeline)
+            self.report(self.on_progress, reported)
+            while not self.is_cancelled() and timeline.add_next():
+                if len(timeline) - reported >= self.batch:
+                    reported = len(timeline)
+                    self.report(self.on_progress, reported)
+            if self.is_cancelled():
+                return
+
+            if timeline.err is not None:
+                self.report(self.on_error, timeline.err_index, timeline.err)
+            if len(timeline) > reported:
+                self.report(self.on_progress, len(timeline))
+            self.report(self.on_done)
+        finally:
+            self.done_event.set()
+
+
+if __name__ == "__main__":
+    import time
+    import pgn
+    from graphics_braille.select_trace import SlTrace
+
+    demo_game_text = """
+    [Event "Third Rosenwald Trophy"]
+    [Result "0-1"]
+    1.Nf3 Nf6 2.c4 g6 3.Nc3 Bg7 4.d4 O-O
+    5.Bf4 d5 6.Qb3 dxc4 7.Qxc4 c6 8.e4 Nbd7
+    9.Rd1 Nb6 10.Qc5 Bg4 11.Bg5 Na4 12.Qa3 Nxc3
+    13.bxc3 Nxe4 14.Bxe7 Qb6 15.Bc4 Nxc3 16.Bc5 Rfe8+
+    17.Kf1 Be6 18.Bxb6 Bxc4+ 19.Kg1 Ne2+ 20.Kf1 Nxd4+
+    21.Kg1 Ne2+ 22.Kf1 Nc3+ 23.Kg1 axb6 24.Qb4 Ra4
+    25.Qxb6 Nxd1 26.h3 Rxa2 27.Kh2 Nxf2 28.Re1 Rxe1
+    29.Qd8+ Bf8 30.Nxe1 Bd5 31.Nf3 Ne4 32.Qb8 b5
+    33.h4 h5 34.Ne5 Kg7 35.Kg1 Bc5+ 36.Kf1 Ng3+
+    37.Ke1 Bb4+ 38.Kd1 Bb3+ 39.Kc1 Ne2+ 40.Kb1
+    Nc3+ 41.Kc1 Rc2# 0-1
+    """
+    SlTrace.clearFlags()
+    game = pgn.loads(demo_game_text)[0]
+
+    def progress(worker, count):
+        SlTrace.lg(f"progress: {count} positions")
+
+    def error(worker, index, err):
+        SlTrace.lg(f"error at move {index+1}: {err}")
+
+    def done(worker):
+        timeline = worker.timeline
+        SlTrace.lg(f"done: {len(timeline)} positions"
+                   f" result: {timeline.game_result}")
+
+    time_start = time.time()
+    worker = ChessTimelineWorker(game=game, on_progress=progress,
+                                 on_error=error, on_done=done).start()
+    worker.wait()
+    SlTrace.lg(f"{time.time()-time_start:.3f} sec")
+    sync = ChessGameTimeline(game=game).build()
+    assert sync.snapshots == worker.timeline.snapshots
+
+    bad = ChessTimelineWorker(moves=["e4", "e5", "Nf3", "Nf6", "Ke3"],
+                              on_error=error, on_done=done).start()
+    bad.wait()
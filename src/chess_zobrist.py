@@ -0,0 +1,120 @@
+#chess_zobrist.py 18Oct2026  crs, Author
+"""
+Zobrist hashing of chess positions
+A position's key is the XOR of a fixed random 64 bit number for:
+    each (piece, square) on the board
+    black to move
+    each castling right held
+    the en passant file, only when a pawn of the side to
+        move is in place to make the capture (so positions
+        which differ only by an unusable en passant square
+        have the same key, as repetition requires)
+Chessboard keeps the piece part up to date in set_sq, by XORing
+out the previous contents and XORing in the new.  The few state
+terms are folded in when the key is read (get_zobrist_key).
+Keys are generated from a fixed seed so they are the same
+from run to run, e.g. for saved caches or indexes.
+"""
+import random
+
+from chess_mailbox import ChessMailbox
+
+class ChessZobrist:
+    SEED = 20261018
+
+    zobrist_by_size = {}    # ChessZobrist by (nsqx,nsqy)
+
+    @classmethod
+    def get_zobrist(cls, nsqx=8, nsqy=8):
+        """ Get shared keys for board size
+        :nsqx: number of files default: 8
+        :nsqy: number of ranks default: 8
+        :returns: ChessZobrist instance
+        """
+        size = (nsqx, nsqy)
+        if size not in cls.zobrist_by_size:
+            cls.zobrist_by_size[size] = ChessZobrist(nsqx, nsqy)
+        return cls.zobrist_by_size[size]
+
+    def __init__(self, nsqx=8, nsqy=8):
+        """ Generate keys
+        :nsqx: number of files
+        :nsqy: number of ranks
+        """
+        self.mailbox = mailbox = ChessMailbox.get_mailbox(nsqx, nsqy)
+        rand = random.Random(self.SEED)
+        self.piece_keys = {}        # by piece, list by mailbox index
+        for piece in "KQRBNPkqrbnp":
+            keys = [0]*mailbox.size
+            for index in mailbox.on_board_indexes:
+                keys[index] = rand.getrandbits(64)
+            self.piece_keys[piece] = keys
+        self.black_to_move_key = rand.getrandbits(64)
+        self.castle_keys = {
+            "white_kingside" : rand.getrandbits(64),
+            "white_queenside" : rand.getrandbits(64),
+            "black_kingside" : rand.getrandbits(64),
+            "black_queenside" : rand.getrandbits(64),
+            }
+        self.en_passant_file_keys = {}      # by file letter
+        for file in range(1, nsqx+1):
+            self.en_passant_file_keys[chr(ord('a')+file-1)] = rand.getrandbits(64)
+
+    def __deepcopy__(self, memo):
+        """ Keys are never changed so are shared by copies
+        """
+        return self
+
+    def piece_key(self, board_setting):
+        """ Compute the piece part of a key from scratch
+        :board_setting: dictionary, by sq, of piece/None
+        :returns: XOR of piece-square keys
+        """
+        key = 0
+        sq_index = self.mailbox.sq_index
+        for sq, piece in board_setting.items():
+            if piece is not None and sq in sq_index:
+                key ^= self.piece_keys[piece][sq_index[sq]]
+        return key
+
+    def state_key(self, board):
+        """ Key part for side to move, castling rights
+        and usable en passant square
+        :board: Chessboard
+        :returns: XOR of state keys
+        """
+        key = 0
+        if board.to_move == "black":
+            key ^= self.black_to_move_key
+        if board.can_castle_white_kingside:
+            key ^= self.castle_keys["white_kingside"]
+        if board.can_castle_white_queenside:
+            key ^= self.castle_keys["white_queenside"]
+        if board.can_castle_black_kingside:
+            key ^= self.castle_keys["black_kingside"]
+        if board.can_castle_black_queenside:
+            key ^= self.castle_keys["black_queenside"]
+        ep_sq = board.poss_en_passant
+        if ep_sq is not None and self.en_passant_capturable(board, ep_sq):
+            key ^= self.en_passant_file_keys[ep_sq[0]]
+        return key
+
+    def en_passant_capturable(self, board, ep_sq):
+        """ Check if a pawn of the side to move is next to
+        the pawn which may be taken en passant
+        :board: Chessboard
+        :ep_sq: en passant square
+        :returns: True if a capture is in place (legality not checked)
+        """
+        mailbox = self.mailbox
+        if ep_sq not in mailbox.sq_index:
+            return False
+
+        if board.to_move == "white":
+            pawn, behind = "P", -mailbox.width
+        else:
+            pawn, behind = "p", mailbox.width
+        pawn_index = mailbox.sq_index[ep_sq] + behind   # pawn which passed
+        mb_setting = board.mb_setting
+        return (mb_setting[pawn_index-1] == pawn
+                or mb_setting[pawn_index+1] == pawn)
@@ -6,7 +6,6 @@ Goals:
     efficient access
 """
 import re
-import copy
 
 from graphics_braille.select_trace import SlTrace
 
@@ -15,8 +14,19 @@ from chess_save_unit import ChessSaveUnit
 from chess_move import ChessMove
 from chess_error import ChessError
 from chess_fen import ChessFEN
+from chess_mailbox import ChessMailbox
+from chess_attack_tables import ChessAttackTables
+from chess_zobrist import ChessZobrist
+from chess_move_cache import ChessMoveCache
+from chess_san_cache import ChessSanCache
+from chess_bitboard import ChessBitboard
+from chess_position_snapshot import PositionSnapshot
+from chess_replay_result import ChessReplayResult
+import chess_move_to_san
 
 class Chessboard:
+    ENGINES = ("mailbox", "dict", "bitboard")
+    PIECES = "KQRBNPkqrbnp"
     att_pieces_black = ["k", "q", "r", "b", "n", "p"]
     att_pieces_white = [x.upper() for x in att_pieces_black ]
 
@@ -25,7 +35,8 @@ class Chessboard:
                  nsqx = 8,
                  nsqy = 8,
                  to_move = "white",
-                 standard_setup=True
+                 standard_setup=True,
+                 engine="mailbox"
                 ):
         """ Setup board, optional display
         :pieces: pieces to add
@@ -45,16 +56,35 @@ class Chessboard:
                 default: 8
         :nsqy: Number of squares vertical
                 default: 8
-        """
+        :engine: move generation board representation
+                "mailbox" - integer indexed board (chess_mailbox.py)
+                "dict" - square string stepping, kept for reference
+                "bitboard" - 64 bit integer bitboards (chess_bitboard.py)
+                            8x8 board only
+                default: "mailbox"
+        """
+        if engine not in self.ENGINES:
+            raise ChessError(f"engine:{engine} is not one of {self.ENGINES}")
+        self.engine = engine
+        self.mailbox = ChessMailbox.get_mailbox(nsqx, nsqy)
+        self.attack_tables = ChessAttackTables.get_tables(nsqx, nsqy)
+        self.zobrist = ChessZobrist.get_zobrist(nsqx, nsqy)
+        self.move_cache = ChessMoveCache.get_default()  # shared by boards
+        self.san_cache = ChessSanCache.get_default()    # shared by boards
         self.pieces = pieces
         self.piece_squares = []    # Initial list of pieces, if any
         
         self.nsqx = nsqx
         self.nsqy = nsqy
+        self.bitboards = None   # Set iff bitboard engine
+        if engine == "bitboard":
+            self.bitboards = ChessBitboard(self)
         self.to_move = to_move
         self.cm = None          # ChessMove
         self.move_stack = []    # Stack of ChessSaveUnit
         self.move_redo_stack = []   # Stack of ChessSaveUnit of undos
+        self.trial_stack = []   # Stack of in place move undo info
+                                # see make_trial_move
         self.update = True # Default - update after make_move
         self.moved_pieces_d = {}  #dictionary, by initial square
                                   #  of pieces who have moved
@@ -68,10 +98,49 @@ class Chessboard:
         if err:
             raise ChessError(err)
         
-    def copy(self):
+    def copy(self, include_history=True):
         """ Copy information for independant opperation
+        Only the position is duplicated: board contents (with
+        mailbox, piece lists, bitboards and Zobrist key), clocks,
+        castling flags and en passant state.  Size tables and the
+        move cache are shared, the current move (cm) is shared and
+        a fresh ChessPieceMovement is made for the copy.
+        Much cheaper than copy.deepcopy, which walks every object
+        reachable from the board.
+        :include_history: True - copy move history (move_stack,
+                    move_redo_stack), save units pointed at the copy
+                    so undo works on the copy
+                False - copy starts with no move history
+                default: True
+        :returns: new Chessboard
+        """
+        cb_new = type(self).__new__(type(self))    # No setup_board
+        cb_new.__dict__.update(self.__dict__)
+        cb_new.board_setting = self.board_setting.copy()
+        cb_new.mb_setting = self.mb_setting[:]
+        cb_new.piece_sqs = {piece: sqs.copy()
+                            for piece, sqs in self.piece_sqs.items()}
+        cb_new.moved_pieces_d = self.moved_pieces_d.copy()
+        cb_new.piece_squares = self.piece_squares[:]
+        cb_new.trial_stack = self.trial_stack[:]    # entries not changed
+        if self.bitboards is not None:
+            cb_new.bitboards = self.bitboards.copy(cb_new)
+        cb_new.cpm = ChessPieceMovement(cb_new)
+        if include_history:
+            cb_new.move_stack = [csu.copy(cb_new)
+                                 for csu in self.move_stack]
+            cb_new.move_redo_stack = [csu.copy(cb_new)
+                                      for csu in self.move_redo_stack]
+        else:
+            cb_new.move_stack = []
+            cb_new.move_redo_stack = []
+        return cb_new
+
+    def __deepcopy__(self, memo):
+        """ copy.deepcopy uses our copy, with history
         """
-        cb_new = copy.deepcopy(self)        
+        cb_new = self.copy()
+        memo[id(self)] = cb_new
         return cb_new
                               
     def setup_board(self, pieces=None, standard_setup=True):
@@ -158,7 +227,15 @@ class Chessboard:
         
         self.clear_board()
         self.piece_squares = []        
-        cf.export_to_bd(self)    
+        cf.export_to_bd(self)
+        self.sync_setting()     # export sets board_setting directly
+        if self.poss_en_passant is not None:
+            # The pawn which just passed the en passant square
+            ep_file, ep_rank = self.sq_to_file_rank(self.poss_en_passant,
+                                                    to_int=True)
+            pawn_rank = ep_rank+1 if self.to_move == "white" else ep_rank-1
+            self.poss_en_passant_rm_sq = self.file_rank_to_sq(
+                                        file=ep_file, rank=pawn_rank)
         return None
     """ 
     Internal board access
@@ -394,12 +471,18 @@ class Chessboard:
         """
         piece = piece_square[0]
         sq = piece_square[1:]
-        self.board_setting[sq] = piece
+        self.set_sq(sq, piece)
         
     def clear_board(self):
         """ Empty board of pieces
         """
         self.board_setting = {}     # Board is dictionary of piece(e.g. K) by <square> e.g., e1
+        self.mb_setting = self.mailbox.new_setting()  # Same contents, by mailbox index
+        self.piece_sqs = {piece: {} for piece in self.PIECES}
+                                    # by piece, dictionary of its squares
+        self.zobrist_piece_key = 0  # piece part of Zobrist key
+        if self.bitboards is not None:
+            self.bitboards.clear()
         self.half_move_clock = 0
         self.full_move_clock = 0
         self.poss_en_passant = None
@@ -413,7 +496,7 @@ class Chessboard:
         """ Empty square
         :sq: square notation, e.g., e1
         """
-        self.board_setting[sq] = None   # Leave for easy access
+        self.set_sq(sq, None, keep_sq=True)   # Leave for easy access
         
     def get_piece(self, sq=None, file=None, rank=None, remove=False):
         """ Get piece at sq, None if empty
@@ -448,8 +531,99 @@ class Chessboard:
         """ Remove piece from square
         :sq: sq to remove OK if sq is empty
         """
-        if sq in self.board_setting:
-            del self.board_setting[sq]
+        self.set_sq(sq, None)
+
+    def set_sq(self, sq, piece, keep_sq=False):
+        """ Set square contents
+        All board content changes come through here
+        so board_setting, mb_setting, piece_sqs, bitboards and
+        the Zobrist key stay in step
+        :sq: square notation e.g. e1
+        :piece: new contents None - empty
+        :keep_sq: True - leave empty sq entry in board_setting
+                default: remove sq from board_setting if empty
+        """
+        bs = self.board_setting
+        prev_piece = bs.get(sq)
+        if prev_piece is not None:
+            del self.piece_sqs[prev_piece][sq]
+        if piece is not None:
+            self.piece_sqs.setdefault(piece, {})[sq] = True
+        if piece is not None or keep_sq:
+            bs[sq] = piece
+        elif sq in bs:
+            del bs[sq]
+        index = self.mailbox.sq_index.get(sq)
+        if index is not None:
+            if self.bitboards is not None:
+                self.bitboards.set_sq(sq, self.mb_setting[index], piece)
+            self.mb_setting[index] = piece
+            piece_keys = self.zobrist.piece_keys
+            if prev_piece is not None:
+                self.zobrist_piece_key ^= piece_keys[prev_piece][index]
+            if piece is not None:
+                self.zobrist_piece_key ^= piece_keys[piece][index]
+
+    def sync_setting(self):
+        """ Rebuild mb_setting, piece_sqs, bitboards and
+        Zobrist key from board_setting
+        For use after board_setting is set directly
+        e.g. by ChessFEN.export_to_bd
+        """
+        self.mb_setting = self.mailbox.new_setting()
+        self.piece_sqs = {piece: {} for piece in self.PIECES}
+        sq_index = self.mailbox.sq_index
+        for sq, piece in self.board_setting.items():
+            if piece is not None:
+                self.piece_sqs.setdefault(piece, {})[sq] = True
+            index = sq_index.get(sq)
+            if index is not None:
+                self.mb_setting[index] = piece
+        if self.bitboards is not None:
+            self.bitboards.sync(self.board_setting)
+        self.zobrist_piece_key = self.zobrist.piece_key(self.board_setting)
+
+    def get_zobrist_key(self):
+        """ Get position's 64 bit Zobrist key
+        covering pieces, side to move, castling rights
+        and a usable en passant square (chess_zobrist.py)
+        Equal positions have equal keys
+        :returns: key (int)
+        """
+        return self.zobrist_piece_key ^ self.zobrist.state_key(self)
+
+    def get_snapshot(self):
+        """ Get immutable, compact copy of the position
+        :returns: PositionSnapshot
+        """
+        return PositionSnapshot.from_board(self)
+
+    def load_snapshot(self, snapshot):
+        """ Set position from snapshot
+        Move history is not changed
+        :snapshot: PositionSnapshot
+        """
+        snapshot.load_into(self)
+
+    def same_position(self, other):
+        """ Check if other board has the same position
+        (pieces, side to move, castling rights, en passant)
+        Compares keys first, then contents to rule out collision
+        :other: Chessboard
+        :returns: True if same position
+        """
+        if self.get_zobrist_key() != other.get_zobrist_key():
+            return False
+        
+        if (self.to_move != other.to_move
+                or self.castle_rights() != other.castle_rights()):
+            return False
+        
+        for piece, sqs in self.piece_sqs.items():
+            if sqs.keys() != other.get_piece_sqs(piece).keys():
+                return False
+            
+        return True
 
     def get_adj_sq(self, sq, dir):
         """ Get adjacent square in direction (x,y) 
@@ -570,24 +744,47 @@ class Chessboard:
             for pc in piece:
                 pss.extend(self.get_pieces(piece=pc))
             return pss
-            
-        if piece_type is not None:
-            piece_type = piece_type.lower()
+        
+        if piece is None and piece_type is None:
+            pieces = self.piece_sqs     # all pieces
+        else:
+            pieces = []
+            if piece is not None:
+                pieces.append(piece)
+            if piece_type is not None:
+                piece_type = piece_type.lower()
+                for pce in (piece_type.upper(), piece_type):
+                    if pce not in pieces:
+                        pieces.append(pce)
         piece_squares = []  # list <piece><rank><file>
-        piece_by_squares = {}
-        for sq in self.board_setting:
-            pce = self.board_setting[sq]
-            if pce is None:
-                continue        # Ignore empty
-            ptype = pce.lower()
-            ps = None if piece is None else pce+sq
-            if ((piece is not None and pce == piece)
-                or (piece_type is not None and 
-                    ptype == piece_type)
-                or piece is None and piece_type is None):
+        for pce in pieces:
+            if pce in self.piece_sqs:
+                for sq in self.piece_sqs[pce]:
                     piece_squares.append(pce+sq)
-                    piece_by_squares[sq] = pce  # for inversion
         return piece_squares
+
+    def get_piece_sqs(self, piece):
+        """ Get squares occupied by piece
+        Kept up to date by set_sq - do not modify
+        :piece: piece e.g. K
+        :returns: dictionary, by sq, of piece's squares
+        """
+        if piece not in self.piece_sqs:
+            return {}
+        
+        return self.piece_sqs[piece]
+
+    def get_king_sq(self, to_move=None):
+        """ Get king's square
+        :to_move: white/black default: board's to_move
+        :returns: king's square, None if no king
+        """
+        if to_move is None:
+            to_move = self.to_move
+        for sq in self.piece_sqs["K" if to_move == "white" else "k"]:
+            return sq
+        
+        return None
     
 
     """
@@ -819,7 +1016,7 @@ class Chessboard:
         if not self.just_notation:
             assert(sq is not None)
         prev_piece = self.get_piece(sq)
-        self.board_setting[sq] = piece
+        self.set_sq(sq, piece, keep_sq=True)
         return prev_piece
 
         
@@ -876,6 +1073,16 @@ class Chessboard:
         fen_str = self.board_to_fen_str()
         SlTrace.lg(fen_str)
 
+    def castle_rights(self):
+        """ Get castling rights
+        :returns: tuple of can_castle white kingside, white queenside,
+                    black kingside, black queenside
+        """
+        return (self.can_castle_white_kingside,
+                self.can_castle_white_queenside,
+                self.can_castle_black_kingside,
+                self.can_castle_black_queenside)
+
     def castle_opportunity(self, to_move="white", kingside=True):
         """ Check if the opportunity for castle is present
         :to_move: whose move default: white
@@ -1032,6 +1239,374 @@ class Chessboard:
             if orig_sq is not None:
                 self.remove_piece(orig_sq)
 
+    """
+    In place move make/unmake
+    Used for legality checking, e.g. would a move leave
+    our king in check, without copying the board.
+    Each make_trial_move is undone by unmake_trial_move
+    in last in, first out order.
+    """
+    SQ_ABSENT = "SQ_ABSENT"     # trial save: sq was not in board_setting
+
+    def make_trial_move(self, orig_sq, dest_sq, promoted_piece=None):
+        """ Make move in place, saving enough to exactly restore
+        the prior board state via unmake_trial_move
+        Handles captures, en passant capture, castling (king moving
+        two files) and promotion.  Updates to_move, castling rights,
+        en passant square and clocks as make_move does.
+        No legality checking is done.
+        :orig_sq: origin square
+        :dest_sq: destination square
+        :promoted_piece: piece replacing pawn on promotion
+                default: pawn stays a pawn
+        :returns: piece moved, None if orig_sq is empty (no change made)
+        """
+        piece = self.get_piece(orig_sq)
+        if piece is None:
+            return None
+
+        changes = []        # (sq, previous contents) in change order
+        self.trial_stack.append((changes, self.to_move,
+                    self.can_castle_white_kingside,
+                    self.can_castle_white_queenside,
+                    self.can_castle_black_kingside,
+                    self.can_castle_black_queenside,
+                    self.poss_en_passant, self.poss_en_passant_rm_sq,
+                    self.half_move_clock, self.full_move_clock))
+        piece_type = piece.lower()
+        dest_piece = self.get_piece(dest_sq)
+        o_file, o_rank = self.sq_to_file_rank(orig_sq, to_int=True)
+        d_file, d_rank = self.sq_to_file_rank(dest_sq, to_int=True)
+        poss_en_passant = self.poss_en_passant
+        self.poss_en_passant = None
+        if piece_type == 'p':
+            if dest_piece is None and dest_sq == poss_en_passant:
+                ep_sq = self.file_rank_to_sq(file=d_file, rank=o_rank)
+                self.trial_set_sq(ep_sq, None, changes)
+            if abs(d_rank - o_rank) == 2:
+                self.poss_en_passant = self.file_rank_to_sq(
+                                    file=o_file, rank=(o_rank+d_rank)//2)
+            self.poss_en_passant_rm_sq = dest_sq
+            if promoted_piece is not None:
+                piece = promoted_piece
+        elif piece_type == 'k' and abs(d_file - o_file) == 2:
+            # Castling - move rook to other side of king
+            if d_file > o_file:
+                rook_sq = self.file_rank_to_sq(file=self.nsqx, rank=o_rank)
+                rook_dest = self.file_rank_to_sq(file=d_file-1, rank=o_rank)
+            else:
+                rook_sq = self.file_rank_to_sq(file=1, rank=o_rank)
+                rook_dest = self.file_rank_to_sq(file=d_file+1, rank=o_rank)
+            rook = self.get_piece(rook_sq)
+            self.trial_set_sq(rook_sq, None, changes)
+            self.trial_set_sq(rook_dest, rook, changes)
+        self.trial_set_sq(orig_sq, None, changes)
+        self.trial_set_sq(dest_sq, piece, changes)
+
+        if piece_type == 'k':
+            if self.to_move == "white":
+                self.can_castle_white_kingside = False
+                self.can_castle_white_queenside = False
+            else:
+                self.can_castle_black_kingside = False
+                self.can_castle_black_queenside = False
+        for sq in (orig_sq, dest_sq):   # rook moving or captured
+            if sq == "h1":
+                self.can_castle_white_kingside = False
+            elif sq == "a1":
+                self.can_castle_white_queenside = False
+            elif sq == "h8":
+                self.can_castle_black_kingside = False
+            elif sq == "a8":
+                self.can_castle_black_queenside = False
+
+        if piece_type == 'p' or dest_piece is not None:
+            self.half_move_clock = 0
+        else:
+            self.half_move_clock += 1
+        if self.to_move == "black":
+            self.full_move_clock += 1
+        self.update_move()
+        return piece
+
+    def unmake_trial_move(self):
+        """ Undo most recent make_trial_move, restoring
+        the exact prior board state
+        :returns: True if undone, False if nothing to undo
+        """
+        if len(self.trial_stack) == 0:
+            return False
+
+        (changes, self.to_move,
+            self.can_castle_white_kingside,
+            self.can_castle_white_queenside,
+            self.can_castle_black_kingside,
+            self.can_castle_black_queenside,
+            self.poss_en_passant, self.poss_en_passant_rm_sq,
+            self.half_move_clock,
+            self.full_move_clock) = self.trial_stack.pop()
+        for sq, prev in reversed(changes):
+            if prev is self.SQ_ABSENT:
+                self.set_sq(sq, None)
+            else:
+                self.set_sq(sq, prev, keep_sq=True)
+        return True
+
+    def trial_set_sq(self, sq, piece, changes):
+        """ Set square contents, recording previous contents
+        :sq: square
+        :piece: new contents None - empty
+        :changes: list of (sq, previous contents) to append to
+        """
+        bs = self.board_setting
+        if sq in bs:
+            changes.append((sq, bs[sq]))
+        else:
+            changes.append((sq, self.SQ_ABSENT))
+        self.set_sq(sq, piece)
+
+
+    def get_cached_move_map(self, to_move=None):
+        """ Get position's entry in the shared position cache
+        (move_cache), adding an empty one if not present
+        The entry is filled, origin square by origin square,
+        as moves are asked for.
+        :to_move: white/black default: board's to_move
+        :returns: dictionary, by origin sq, of legal move_to_sqs
+                    so far - do not modify
+        """
+        if to_move is None:
+            to_move = self.to_move
+        key = (self.get_zobrist_key(), to_move, self.poss_en_passant)
+        move_map = self.move_cache.get(key)
+        if move_map is None:
+            move_map = {}
+            self.move_cache.put(key, move_map)
+        return move_map
+
+    def get_legal_move_to_sqs(self, orig_sq, move_map=None):
+        """ Get legal moves of piece at orig_sq, via position cache
+        :orig_sq: piece's square
+        :move_map: position's cache entry
+                default: get_cached_move_map for piece's side
+        :returns: dictionary, by destination sq, of pre-move contents
+                as get_move_to_sqs - do not modify
+                empty if orig_sq is empty
+        """
+        piece = self.get_piece(orig_sq)
+        if piece is None:
+            return {}
+        
+        if move_map is None:
+            move_map = self.get_cached_move_map(
+                                to_move=self.piece_to_move(piece))
+        move_to_sqs = move_map.get(orig_sq)
+        if move_to_sqs is None:
+            move_to_sqs = self.get_move_to_sqs(piece, orig_sq=orig_sq)
+            move_map[orig_sq] = move_to_sqs
+        return move_to_sqs
+
+    def get_legal_move_map(self, to_move=None):
+        """ Get legal moves of all of a side's pieces
+        via position cache
+        :to_move: white/black default: board's to_move
+        :returns: dictionary, by origin sq, of dictionary, by
+                destination sq, of pre-move contents
+                as get_move_to_sqs - do not modify
+        """
+        if to_move is None:
+            to_move = self.to_move
+        move_map = self.get_cached_move_map(to_move=to_move)
+        legal_move_map = {}
+        for ps in self.get_side_pieces(to_move=to_move):
+            orig_sq = self.ps_to_sq(ps)
+            legal_move_map[orig_sq] = self.get_legal_move_to_sqs(orig_sq,
+                                                    move_map=move_map)
+        return legal_move_map
+
+    def generate_legal_moves(self, side=None):
+        """ Get every legal move for side, in one pass
+        Checks and pins are found once for the position
+        :side: white/black default: board's to_move
+        :returns: list of ChessLegalMove
+                pawn promotion has one move for each of Q,R,B,N
+        """
+        if side is None:
+            side = self.to_move
+        return self.cpm.generate_legal_moves(side)
+
+    def get_legal_moves(self, to_move=None):
+        """ Get all legal moves for side
+        :to_move: white/black default: board's to_move
+        :returns: list of (orig_sq, dest_sq, promoted_piece)
+                promoted_piece is None except for pawn promotion,
+                which has one entry for each of Q,R,B,N
+        """
+        return [(move.orig_sq, move.dest_sq, move.promoted_piece)
+                for move in self.generate_legal_moves(side=to_move)]
+
+    def move_to_san(self, move):
+        """ Get SAN for a move in this position
+        :move: ChessLegalMove or UCI string e.g. g1f3
+        :returns: SAN e.g. Nf3, None if not a legal move
+        """
+        return chess_move_to_san.move_to_san(self, move)
+
+    def moves_to_san(self, moves):
+        """ Get SAN for a sequence of moves from this position
+        Board is unchanged on return
+        :moves: ChessLegalMove or UCI strings, in order
+        :returns: list of SAN, stopping before any illegal move
+        """
+        return chess_move_to_san.moves_to_san(self, moves)
+
+    def get_orig_sqs(self, piece, dest_sq):
+        """ Find squares from which piece can move to dest_sq,
+        working back from dest_sq - king safety not checked
+        :piece: piece e.g. N, p
+        :dest_sq: destination square
+        :returns: list of origin squares
+        """
+        return self.cpm.get_orig_sqs(piece, dest_sq)
+
+    def get_legal_orig_sqs(self, piece, dest_sq, orig_sqs=None):
+        """ Find squares from which piece can legally move to dest_sq
+        :piece: piece e.g. N, p
+        :dest_sq: destination square
+        :orig_sqs: candidate origins default: get_orig_sqs
+        :returns: list of origin squares
+        """
+        return self.cpm.get_legal_orig_sqs(piece, dest_sq,
+                                           orig_sqs=orig_sqs)
+
+    def is_checkmate(self, side=None):
+        """ Check if side is checkmated
+        :side: white/black default: board's to_move
+        :returns: True if in check with no legal move
+        """
+        if side is None:
+            side = self.to_move
+        info = self.cpm.get_check_pin_info(side)
+        if info is None or not info.is_in_check():
+            return False
+        
+        return len(self.generate_legal_moves(side=side)) == 0
+
+    def is_stalemate(self, side=None):
+        """ Check if side is stalemated
+        :side: white/black default: board's to_move
+        :returns: True if not in check with no legal move
+        """
+        if side is None:
+            side = self.to_move
+        info = self.cpm.get_check_pin_info(side)
+        if info is not None and info.is_in_check():
+            return False
+        
+        return len(self.generate_legal_moves(side=side)) == 0
+
+    def replay_game(self, moves, start_fen=None, fens=False, keys=False,
+                    ucis=False):
+        """ Make a game's moves on this board, in place
+        For headless checking: one ChessMove is reused for every
+        move and no move history or per move objects are kept
+        :moves: list of move specifications e.g. ["e4", "e5",...]
+                comments ({...}) are skipped
+        :start_fen: starting position FEN
+                default: board's current position
+        :fens: True - keep FEN of each position
+        :keys: True - keep Zobrist key of each position
+        :ucis: True - keep each move made, UCI form e.g. e7e8q
+        :returns: ChessReplayResult - stops at the game result
+                or at the first move in error (err, err_index)
+        """
+        result = ChessReplayResult(fens=[] if fens else None,
+                                   keys=[] if keys else None,
+                                   ucis=[] if ucis else None)
+        if start_fen is not None:
+            if (err := self.fen_setup(start_fen)) is not None:
+                result.err = err
+                result.err_index = -1       # before first move
+                return result
+
+        if fens:
+            result.fens.append(self.board_to_fen_str())
+        if keys:
+            result.keys.append(self.get_zobrist_key())
+        cm = ChessMove(self)
+        for index, spec in enumerate(moves):
+            if spec.startswith("{"):
+                continue        # comment
+            
+            cm.reset(spec)
+            if (err := cm.decode(spec)):
+                result.err = err
+                result.err_index = index
+                break
+            
+            if cm.game_result is not None:
+                result.game_result = cm.game_result
+                break
+            
+            if (err := self.make_move(orig_sq=cm.orig_sq, dest_sq=cm.dest_sq,
+                                      dest_sq_mod=cm.dest_sq_mod,
+                                      orig2_sq=cm.orig2_sq,
+                                      dest2_sq=cm.dest2_sq,
+                                      dest2_sq_mod=cm.dest2_sq_mod,
+                                      has_movement=cm.has_movement,
+                                      spec=spec)) is not None:
+                result.err = err
+                result.err_index = index
+                break
+            
+            result.nply += 1
+            if ucis:
+                uci = cm.orig_sq + cm.dest_sq
+                if cm.dest_sq_mod is not None:     # promotion
+                    uci += cm.dest_sq_mod.lower()
+                result.ucis.append(uci)
+            if fens:
+                result.fens.append(self.board_to_fen_str())
+            if keys:
+                result.keys.append(self.get_zobrist_key())
+        result.fen = self.board_to_fen_str()
+        return result
+
+    def perft(self, depth):
+        """ Count leaf nodes of the legal move tree
+        Standard move generator correctness/speed check
+        Board is unchanged on return
+        :depth: number of half moves (plies)
+        :returns: number of positions at depth
+        """
+        if depth <= 0:
+            return 1
+        
+        moves = self.generate_legal_moves()
+        if depth == 1:
+            return len(moves)
+        
+        nodes = 0
+        for move in moves:
+            self.make_trial_move(move.orig_sq, move.dest_sq,
+                                 promoted_piece=move.promoted_piece)
+            nodes += self.perft(depth-1)
+            self.unmake_trial_move()
+        return nodes
+
+    def divide(self, depth):
+        """ perft split by first move
+        For finding which move's subtree disagrees with known counts
+        :depth: number of half moves (plies), 1 or more
+        :returns: dictionary, by move (e.g. e2e4, e7e8q), of perft(depth-1)
+        """
+        counts = {}
+        for move in self.generate_legal_moves():
+            self.make_trial_move(move.orig_sq, move.dest_sq,
+                                 promoted_piece=move.promoted_piece)
+            counts[move.uci()] = self.perft(depth-1)
+            self.unmake_trial_move()
+        return counts
 
     def csu_to_move(self, mv_csu):
         """ Convert save unit (ChessSaveUnit) to move (ChessMove)
@@ -1221,6 +1796,16 @@ class Chessboard:
             to_move = self.get_to_move()
         
         target_piece_type = self.piece_to_type(target_piece)
+        if target_piece_type != 'k':
+            # Attackers' full legal moves - from the position cache
+            att_to_move = "black" if to_move == "white" else "white"
+            attacking_psq = {}
+            move_map = self.get_legal_move_map(to_move=att_to_move)
+            for att_sq, att_move_to_sqs in move_map.items():
+                if target_sq in att_move_to_sqs:
+                    attacking_psq[att_sq] = self.get_piece(att_sq)
+            return attacking_psq
+        
         att_pcs = self.att_pieces_black if to_move == "white" else self.att_pieces_white
         att_piece_sqs = self.get_pieces(att_pcs)   
         attacking_psq = {}
@@ -1270,7 +1855,8 @@ class Chessboard:
                 Empty if none
                 None if error
         """
-        return self.cpm.get_move_to_sqs(piece, orig_sq=orig_sq)            
+        return self.cpm.get_move_to_sqs(piece, orig_sq=orig_sq,
+                                        ck_for_check=ck_for_check)
 
 
         
@@ -4,30 +4,244 @@ Provides a stack of chessboards (Chessboard)
 to facilitate such things as undo,redo game branching
 Hosts ChessGotoMove, provider of game position display with move change function
 """
+import sys
 import copy
 
 from chessboard import Chessboard
 from chess_move import ChessMove
 from wx_chess_goto_move import ChessGotoMove
 
+class BoardDelta:
+    """ Change from the previous stack position
+    """
+    __slots__ = ("changes", "state", "moved_added", "moved_removed")
+
+    def __init__(self, changes, state, moved_added, moved_removed):
+        """ Setup delta
+        :changes: list of (sq, piece/None) square content changes
+        :state: tuple of board values, by ChessboardStack.STATE_ATTRS
+        :moved_added: squares added to moved_pieces_d
+        :moved_removed: squares removed from moved_pieces_d
+        """
+        self.changes = changes
+        self.state = state
+        self.moved_added = moved_added
+        self.moved_removed = moved_removed
+
+    def nbytes(self):
+        """ Approximate memory used
+        """
+        return (sys.getsizeof(self) + sys.getsizeof(self.changes)
+                + sum(sys.getsizeof(change) for change in self.changes)
+                + sys.getsizeof(self.state)
+                + sys.getsizeof(self.moved_added)
+                + sys.getsizeof(self.moved_removed))
+
+
 class ChessboardStack:
-    def __init__(self):
-        self.board_stack = []
+    """ Boards are not kept whole.  Each position is kept as a
+    delta (BoardDelta) from the one before, with a checkpoint,
+    a compact copy of the position (PositionSnapshot), every
+    checkpoint_interval positions.
+    get_bd rebuilds a position from the nearest checkpoint.
+    The last pushed board is kept whole, as it may still be
+    changed e.g. by making the move on it
+    """
+    DEFAULT_CHECKPOINT_INTERVAL = 16
+
+    STATE_ATTRS = ("to_move", "half_move_clock", "full_move_clock",
+                   "poss_en_passant", "poss_en_passant_rm_sq",
+                   "can_castle_white_kingside", "can_castle_white_queenside",
+                   "can_castle_black_kingside", "can_castle_black_queenside",
+                   "cm", "game_result")
+
+    def __init__(self, checkpoint_interval=None):
+        """ Setup empty stack
+        :checkpoint_interval: full board every this many positions
+                    1 - every position kept whole
+                default: DEFAULT_CHECKPOINT_INTERVAL
+        """
+        if checkpoint_interval is None:
+            checkpoint_interval = self.DEFAULT_CHECKPOINT_INTERVAL
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval:{checkpoint_interval}"
+                             " must be 1 or more")
+        self.checkpoint_interval = checkpoint_interval
+        self.deltas = []        # BoardDelta by index, None at checkpoints
+        self.checkpoints = {}   # (PositionSnapshot, BoardDelta) by index
+        self.engine = "mailbox" # Engine of rebuilt boards
+        self.keys = []          # Zobrist key by index, below top_bd
+        self.top_bd = None      # Last pushed board, kept whole
+        self.prev_setting = {}  # Contents of position below top_bd
+        self.prev_moved = {}    # moved_pieces_d of position below top_bd
+        self.view_index = None  # Latest rebuilt board's index
+        self.view_bd = None     # Latest rebuilt board
         self.cur_bd_index = -1      # Reference to current board in stack
                                 # < 0 ==> no current board
+
+    def __len__(self):
+        """ Number of positions in stack
+        """
+        if self.top_bd is None:
+            return 0
         
+        return len(self.keys) + 1
 
     def push_bd(self, bd=None):
         """ Push board onto board stack
         :bd: board to push
             default: push current board
-        :returns: copy of bd
+        :returns: stack's board, to which subsequent changes
+                    may be made up to the next push
+                    (bd itself if bd is the last pushed board,
+                    else a copy of bd)
         """
         if bd is None:
             bd = self.get_bd()
-        self.board_stack.append(bd.copy())  # subsequent changs not seen
-        self.cur_bd_index = len(self.board_stack)-1     # Point to last pushed
-        return self.board_stack[self.cur_bd_index]
+        if self.top_bd is not None:
+            self.save_top()
+        if bd is not self.top_bd:
+            bd = bd.copy()      # subsequent changs not seen
+        self.top_bd = bd
+        self.cur_bd_index = len(self)-1     # Point to last pushed
+        return bd
+
+    def clear(self):
+        """ Empty stack, keeping checkpoint interval
+        """
+        self.__init__(checkpoint_interval=self.checkpoint_interval)
+
+    def load_timeline(self, timeline, index=0):
+        """ Replace stack contents with a game's positions
+        so any move can be reached by get_bd/set_cur_bd_index
+        without replaying
+        :timeline: ChessGameTimeline
+        :index: current board index default: 0 - game start
+        :returns: number of positions loaded
+        """
+        self.clear()
+        for ply in range(len(timeline)):
+            self.push_bd(timeline.get_board(ply))
+        self.set_cur_bd_index(index)
+        return len(self)
+
+    def extend_timeline(self, timeline, count=None):
+        """ Add timeline positions beyond the stack's end,
+        e.g. as a worker thread (ChessTimelineWorker) makes them.
+        The current board index is not changed.
+        :timeline: ChessGameTimeline whose start the stack holds
+        :count: positions 0..count-1 are ready
+                default: all the timeline's
+        :returns: number of positions added,
+                None if the stack no longer follows the timeline
+                e.g. a move not from the game was made
+        """
+        if count is None:
+            count = len(timeline)
+        nstack = len(self)
+        if nstack == 0 or nstack > count:
+            return 0
+
+        if self.get_position_key(nstack-1) != timeline.keys[nstack-1]:
+            return None
+
+        cur_bd_index = self.cur_bd_index
+        for ply in range(nstack, count):
+            self.push_bd(timeline.get_board(ply))
+        self.cur_bd_index = cur_bd_index
+        return count - nstack
+
+    def save_top(self):
+        """ Save last pushed board as a checkpoint or as
+        a delta from the position below it
+        """
+        bd = self.top_bd
+        index = len(self.keys)
+        setting = {sq: piece for sq, piece in bd.board_setting.items()
+                   if piece is not None}
+        moved = bd.moved_pieces_d
+        self.engine = bd.engine
+        if index % self.checkpoint_interval == 0:
+            # Snapshot, plus state and moved pieces it doesn't hold
+            self.checkpoints[index] = (bd.get_snapshot(), BoardDelta(
+                changes=[],
+                state=tuple(getattr(bd, attr, None)
+                            for attr in self.STATE_ATTRS),
+                moved_added=list(moved), moved_removed=[]))
+            self.deltas.append(None)
+        else:
+            prev_setting = self.prev_setting
+            changes = [(sq, None) for sq in prev_setting
+                       if sq not in setting]
+            for sq, piece in setting.items():
+                if prev_setting.get(sq) != piece:
+                    changes.append((sq, piece))
+            prev_moved = self.prev_moved
+            self.deltas.append(BoardDelta(
+                changes=changes,
+                state=tuple(getattr(bd, attr, None)
+                            for attr in self.STATE_ATTRS),
+                moved_added=[sq for sq in moved if sq not in prev_moved],
+                moved_removed=[sq for sq in prev_moved if sq not in moved]))
+        self.keys.append(bd.get_zobrist_key())
+        self.prev_setting = setting
+        self.prev_moved = moved.copy()
+
+    def rebuild_bd(self, index):
+        """ Rebuild saved position from the nearest checkpoint
+        :index: position index, below the last pushed
+        :returns: new Chessboard, without move history
+        """
+        cp_index = index - index % self.checkpoint_interval
+        snapshot, cp_delta = self.checkpoints[cp_index]
+        bd = snapshot.to_board(engine=self.engine)
+        for delta in [cp_delta] + self.deltas[cp_index+1:index+1]:
+            for sq, piece in delta.changes:
+                bd.set_sq(sq, piece)
+            for attr, value in zip(self.STATE_ATTRS, delta.state):
+                setattr(bd, attr, value)
+            for sq in delta.moved_added:
+                bd.moved_pieces_d[sq] = True
+            for sq in delta.moved_removed:
+                del bd.moved_pieces_d[sq]
+        return bd
+
+    def get_memory_stats(self):
+        """ Get stack memory use
+        :returns: dictionary of plies, checkpoints, deltas,
+                checkpoint_interval, checkpoint_bytes, delta_bytes,
+                bytes_per_ply
+        """
+        checkpoint_bytes = 0
+        for snapshot, cp_delta in self.checkpoints.values():
+            checkpoint_bytes += snapshot.nbytes() + cp_delta.nbytes()
+        ndelta = 0
+        delta_bytes = 0
+        for delta in self.deltas:
+            if delta is not None:
+                ndelta += 1
+                delta_bytes += delta.nbytes()
+        nply = len(self)
+        return {
+            "plies" : nply,
+            "checkpoints" : len(self.checkpoints),
+            "deltas" : ndelta,
+            "checkpoint_interval" : self.checkpoint_interval,
+            "checkpoint_bytes" : checkpoint_bytes,
+            "delta_bytes" : delta_bytes,
+            "bytes_per_ply" : ((checkpoint_bytes+delta_bytes)/nply
+                                if nply > 0 else 0.0),
+            }
+
+    def memory_str(self):
+        """ Get memory use as a printable string
+        """
+        stats = self.get_memory_stats()
+        return (f"board stack: {stats['plies']} plies"
+                f" {stats['checkpoints']} checkpoints"
+                f" (every {stats['checkpoint_interval']})"
+                f" {stats['deltas']} deltas"
+                f" {stats['bytes_per_ply']:.0f} bytes/ply")
             
     def move_undo(self):
         """ Undo current move
@@ -60,7 +274,7 @@ class ChessboardStack:
                 Negative: from end, e.g. -1 last 
         """
         if index < 0:
-            index = len(self.board_stack)-index
+            index = len(self)+index
         self.cur_bd_index = index
                     
     def get_bd(self, back=None, index=None):
@@ -77,8 +291,14 @@ class ChessboardStack:
         bd_index = self.get_bd_index(back=back, index=index)
         if bd_index is None:
             return None
-                
-        return self.board_stack[bd_index]
+        
+        if bd_index == len(self)-1:
+            return self.top_bd
+        
+        if bd_index != self.view_index:
+            self.view_bd = self.rebuild_bd(bd_index)
+            self.view_index = bd_index
+        return self.view_bd
                     
     def get_bd_index(self, back=None, index=None):
         """ Get board index in stack
@@ -99,7 +319,7 @@ class ChessboardStack:
         if bd_index < 0:
             return None
         
-        if bd_index > len(self.board_stack)-1:
+        if bd_index > len(self)-1:
             return None
         
         return bd_index
@@ -130,12 +350,72 @@ class ChessboardStack:
             desc = "Begin Game"
         return desc
     
+    def get_position_key(self, index=None):
+        """ Get board's position (Zobrist) key
+        :index: board index default: current board
+        :returns: key, None if no such board
+        """
+        bd_index = self.get_bd_index(index=index)
+        if bd_index is None:
+            return None
+        
+        if bd_index == len(self)-1:
+            return self.top_bd.get_zobrist_key()
+        
+        return self.keys[bd_index]
+
+    def same_position(self, index1, index2=None):
+        """ Check if two stack boards have the same position
+        :index1: board index
+        :index2: board index default: current board
+        :returns: True if same position
+        """
+        bd1 = self.get_bd(index=index1)
+        bd2 = self.get_bd(index=index2)
+        if bd1 is None or bd2 is None:
+            return False
+        
+        return bd1.same_position(bd2)
+
+    def repetition_count(self, index=None):
+        """ Count occurrences of a board's position
+        in the stack up to and including that board
+        :index: board index default: current board
+        :returns: number of occurrences, 0 if no such board
+        """
+        bd_index = self.get_bd_index(index=index)
+        if bd_index is None:
+            return 0
+        
+        key = self.get_position_key(index=bd_index)
+        bd = self.get_bd(index=bd_index)
+        count = 0
+        for prev_index in range(bd_index+1):
+            if (self.get_position_key(index=prev_index) == key
+                    and self.get_bd(index=prev_index).same_position(bd)):
+                count += 1
+        return count
+
+    def is_repetition(self, count=3, index=None):
+        """ Check for repeated position e.g. threefold repetition
+        :count: number of occurrences default: 3
+        :index: board index default: current board
+        :returns: True if position has occurred at least count times
+        """
+        return self.repetition_count(index=index) >= count
+    
     def copy(self):
         """ Copy chess stack
         :returns: copy of stack
         """
         new_cbs = copy.copy(self)
-        new_cbs.board_stack = self.board_stack[:]
+        new_cbs.deltas = self.deltas[:]     # deltas, checkpoints not changed
+        new_cbs.checkpoints = self.checkpoints.copy()
+        new_cbs.keys = self.keys[:]
+        if self.top_bd is not None:
+            new_cbs.top_bd = self.top_bd.copy()
+        new_cbs.view_index = None
+        new_cbs.view_bd = None
         return new_cbs
     
     """ 
@@ -73,6 +73,39 @@ class PGNGame(object):
 
         self.moves = []
     
+    @property
+    def moves(self):
+        '''
+        Moves list, parsed from the movetext on first access for games
+        from ``loads(text, lazy=True)``.
+        '''
+        if self._movetext is not None:
+            lines = _pre_process_text(self._movetext)
+            self._moves = _parse_moves(' '.join(line.strip()
+                                                for line in lines).strip())
+            self._movetext = None
+        return self._moves
+
+    @moves.setter
+    def moves(self, moves):
+        self._moves = moves
+        self._movetext = None
+
+    def set_movetext(self, movetext):
+        '''
+        Keep unparsed movetext, parsed into moves when first used.
+        '''
+        self._moves = None
+        self._movetext = movetext
+
+    def has_moves(self):
+        '''
+        True if game has moves, without parsing deferred movetext.
+        '''
+        if self._movetext is not None:
+            return True
+        return bool(self._moves)
+
     def dumps(self):
         return dumps(self)
 
@@ -83,6 +116,47 @@ class PGNGame(object):
             st += f" ... {self.result}"
         return st
 
+def iter_game_texts(game_file):
+    '''
+    Generator of the text of each game in an open PGN file, read a
+    line at a time so only one game's text is held.
+
+    A game ends where a tag line (``[``) follows move lines, the
+    same split ``loads`` makes.
+    '''
+    game_lines = []
+    in_moves = False
+    for line in game_file:
+        stripped = line.strip()
+        if stripped.startswith('['):
+            if in_moves:
+                yield ''.join(game_lines)
+                game_lines = []
+                in_moves = False
+        elif stripped and not stripped.startswith(';'):
+            in_moves = True
+
+        game_lines.append(line)
+
+    if game_lines:
+        yield ''.join(game_lines)
+
+def iter_games(game_file):
+    '''
+    Generator of the PGNGames in an open PGN file, one at a time,
+    e.g.::
+
+        with open('morphy.pgn') as game_file:
+            for game in pgn.iter_games(game_file):
+                ...
+
+    Memory is bounded by the largest game, not the file.  Only tags
+    are parsed until a game's moves are used.
+    '''
+    for game_text in iter_game_texts(game_file):
+        for game in loads(game_text, lazy=True):
+            yield game
+
 class GameStringIterator(object):
     """
         Iterator containing multiline strings
@@ -95,38 +169,21 @@ class GameStringIterator(object):
                 file_name (str): PGN file name
         """
         self.file_name = file_name
-        self.file_iter = iter(open(self.file_name))
-        self.game_lines = []
-        self.end = False
+        self.game_texts = self._game_texts()
+
+    def _game_texts(self):
+        with open(self.file_name) as game_file:
+            yield from iter_game_texts(game_file)
 
     def __iter__(self):
         """doc"""
         return self
 
-    def next(self):
+    def __next__(self):
         """doc"""
-        if self.end is True:
-            raise StopIteration
-        try:
-            while True:
-                line = self.file_iter.next()
-                if line.startswith("[Event"):
-                    if len(self.game_lines) == 0:
-                        self.game_lines.append(line)
-                        continue
-                    else:
-                        game_lines = self.game_lines[:]
-                        self.game_lines = []
-                        self.game_lines.append(line)
-                        game_str = "".join(game_lines)
-                        return game_str
-                else:
-                    self.game_lines.append(line)
-        except StopIteration:
-            game_lines = self.game_lines[:]
-            game_str = "".join(game_lines)
-            self.end = True
-            return game_str
+        return next(self.game_texts)
+
+    next = __next__
 
 class GameIterator(object):
     """
@@ -138,17 +195,22 @@ class GameIterator(object):
             Args:
                 file_name (str): PGN file name
         """
-        self.game_str_iterator = GameStringIterator(file_name)
+        self.file_name = file_name
+        self.games = self._games()
+
+    def _games(self):
+        with open(self.file_name) as game_file:
+            yield from iter_games(game_file)
 
     def __iter__(self):
         """doc"""
         return self
 
-    def next(self):
+    def __next__(self):
         """doc"""
-        for game_str in self.game_str_iterator:
-            game = loads(game_str)[0]
-            return game
+        return next(self.games)
+
+    next = __next__
 
 def _pre_process_text(text):
     '''
@@ -221,10 +283,48 @@ def _parse_moves(token):
     
     return moves
 
-def loads(text):
+def _loads_lazy(text):
+    '''
+    Converts a string ``text`` into a list of PNGGames, parsing only tag
+    lines.  Each game keeps its movetext, a slice of ``text``, which is
+    parsed when the game's moves are first used.  Games and tags are as
+    ``loads`` gives.
+    '''
+    games = []
+    game = None
+    move_start = move_end = None    # Current game's movetext
+    pos = 0
+    for line in text.split('\n'):
+        line_end = pos + len(line) + 1
+        first = line.lstrip()[:1]
+        if first == '[':
+            if not game or move_start is not None:
+                if move_start is not None:
+                    game.set_movetext(text[move_start:move_end])
+                    move_start = None
+                game = PGNGame()
+                games.append(game)
+            token = re.sub(r'(\s*;.*|^\s*)', '', line).strip()
+            tag, value = _parse_tag(token)
+            setattr(game, tag, value)
+        elif first and first != ';' and game:
+            if move_start is None:
+                move_start = pos
+            move_end = line_end
+        pos = line_end
+    if move_start is not None:
+        game.set_movetext(text[move_start:move_end])
+
+    return games
+
+def loads(text, lazy=False):
     '''
     Converts a string ``text`` into a list of PNGGames
+    ``lazy`` True parses just the tags, moves being parsed on first use.
     '''
+    if lazy:
+        return _loads_lazy(text)
+
     games = []
     game = None
     lines = _pre_process_text(text)
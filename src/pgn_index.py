@@ -0,0 +1,303 @@
+#pgn_index.py 18Oct2026  crs, Author
+"""
+Byte offset index of the games in a PGN file, for going straight
+to game N without parsing the games before it.
+
+Each game's entry holds its byte offset, length and key header
+tags (KEY_TAGS), enough for a game list.  The index is built in
+one pass over the file's lines, without parsing moves, and saved
+beside the file as JSON (e.g. Carlsen.pgn.idx).  It is reused while the
+file's size and modification time are unchanged.  When the file
+has grown and its last indexed game is unchanged (games
+appended), only the new part is indexed.
+
+Games are split as pgn.iter_game_texts splits them: where a tag
+line follows move lines.  The file is memory mapped and searched
+for blocks of tag lines, and for move lines between them, with
+compiled bytes expressions; nothing is decoded but key tag values
+until a game is read.  Text is decoded as UTF-8, else Latin-1
+(decode_text).  Tag lines are taken to start their line
+(no leading spaces), as in PGN export format.
+"""
+import os
+import re
+import mmap
+import json
+import zlib
+
+from graphics_braille.select_trace import SlTrace
+
+import pgn
+
+def decode_text(data):
+    """ Decode PGN file bytes
+    UTF-8, else Latin-1 (e.g. older archives) which decodes any bytes
+    :data: bytes
+    :returns: str
+    """
+    try:
+        return data.decode()
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+def read_game_text(game_file, offset, length):
+    """ Read a game's text from its byte span
+    :game_file: PGN file open in binary mode
+    :offset: game's byte offset
+    :length: game's length in bytes
+    :returns: game's text, as read in text mode
+    """
+    game_file.seek(offset)
+    return decode_text(game_file.read(length)).replace("\r\n", "\n")
+
+class PgnIndex:
+    FILE_VERSION = 1        # Saved file format
+    INDEX_EXT = ".idx"      # Index file: game file name + INDEX_EXT
+    KEY_TAGS = ("event", "site", "date", "round",
+                "white", "black", "result")
+    # Tag lines start their line, as in PGN export format
+    TAG_BLOCK_RE = re.compile(rb'\n(\[[^\n]*(?:\n\[[^\n]*)*)')
+    FIRST_BLOCK_RE = re.compile(rb'\[[^\n]*(?:\n\[[^\n]*)*')
+    KEY_TAG_RE = re.compile(rb"""
+        ^\[ (event|site|date|round|white|black|result)
+        [ \t]+ ([^\n]*)""",                        # as pgn._parse_tag
+        re.MULTILINE | re.VERBOSE | re.IGNORECASE)
+    MOVE_LINE_RE = re.compile(rb'^[ \t\r\f\v]*[^\s;\[]',
+                              re.MULTILINE) # not blank, comment or tag
+
+    @classmethod
+    def get_index(cls, file_name):
+        """ Get index for file, loading the saved index
+        and bringing it up to date
+        :file_name: PGN file
+        :returns: PgnIndex
+        """
+        index = cls(file_name)
+        index.update()
+        return index
+
+    def __init__(self, file_name):
+        """ Setup empty index - see update
+        :file_name: PGN file
+        """
+        self.file_name = file_name
+        self.index_file_name = file_name + self.INDEX_EXT
+        self.entries = []       # (offset, length, tags) by game index
+        self.file_size = 0      # File size, mtime indexed
+        self.file_mtime = None
+        self.last_crc = None    # crc32 of last game's bytes
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_tags(self, game_index):
+        """ Get game's key tags
+        :game_index: game index, from 0
+        :returns: dictionary, by lower case tag name, of values
+        """
+        return self.entries[game_index][2]
+
+    def update(self):
+        """ Bring index up to date with file, saving it if changed
+        :returns: number of games (re)indexed, 0 if up to date
+        """
+        stat = os.stat(self.file_name)
+        if self.file_mtime is None:
+            self.load()
+        if (self.file_size == stat.st_size
+                and self.file_mtime == stat.st_mtime_ns):
+            return 0
+
+        start = 0
+        if (self.entries and stat.st_size > self.file_size
+                and self.last_crc == self.get_crc(len(self.entries)-1)):
+            start = self.entries.pop()[0]     # Games appended, redo last
+        else:
+            self.entries = []
+        nbefore = len(self.entries)
+        self.scan(start)
+        self.file_size = stat.st_size
+        self.file_mtime = stat.st_mtime_ns
+        self.save()
+        return len(self.entries) - nbefore
+
+    def scan(self, start=0):
+        """ Index games from byte offset to end of file
+        The file is memory mapped and searched for blocks of tag
+        lines with compiled bytes expressions, only key tag values
+        are decoded
+        :start: byte offset of a game's start
+        """
+        with open(self.file_name, "rb") as game_file:
+            if os.fstat(game_file.fileno()).st_size <= start:
+                return          # Nothing to index
+
+            with mmap.mmap(game_file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mm:
+                game_offset = None
+                tags = {}
+                prev_end = start        # End of previous tag block
+                for block_start, block_end in self.tag_blocks(mm, start):
+                    if game_offset is None:
+                        game_offset = start
+                    elif self.MOVE_LINE_RE.search(mm, prev_end, block_start):
+                        self.add_entry(game_offset, block_start, tags)
+                        game_offset = block_start
+                        tags = {}
+                    for tag, value in self.KEY_TAG_RE.findall(
+                                        mm, block_start, block_end):
+                        tags[tag.lower().decode()] = decode_text(
+                            value).strip().strip('"[] ')
+                    prev_end = block_end
+                if game_offset is not None:
+                    self.add_entry(game_offset, len(mm), tags)
+                    self.last_crc = zlib.crc32(mm[game_offset:])
+
+    def tag_blocks(self, mm, start):
+        """ Find blocks of consecutive tag lines
+        Searching for the two bytes newline, [ is much faster
+        than testing every line's start
+        :mm: file contents (mmap)
+        :start: byte offset, at a line's start
+        :returns: (start, end) byte offsets of each block
+        """
+        pos = start
+        if mm[start:start+1] == b'[':
+            block = self.FIRST_BLOCK_RE.match(mm, start)
+            yield block.span()
+            pos = block.end()
+        for block in self.TAG_BLOCK_RE.finditer(mm, pos):
+            yield block.span(1)
+
+    def add_entry(self, start, end, tags):
+        """ Add game to index
+        :start: game's byte offset
+        :end: byte offset after game
+        :tags: game's key tags
+        """
+        self.entries.append((start, end-start, tags))
+
+    def get_crc(self, game_index):
+        """ Get crc32 of game's bytes as now in file
+        :game_index: game index, from 0
+        """
+        offset, length, _ = self.entries[game_index]
+        with open(self.file_name, "rb") as game_file:
+            game_file.seek(offset)
+            return zlib.crc32(game_file.read(length))
+
+    def save(self):
+        """ Save index beside file, as JSON
+        Not saving (e.g. read-only directory) only loses reuse
+        """
+        try:
+            with open(self.index_file_name, "w", encoding="utf-8") as index_file:
+                json.dump({"version" : self.FILE_VERSION,
+                           "file_size" : self.file_size,
+                           "file_mtime" : self.file_mtime,
+                           "last_crc" : self.last_crc,
+                           "entries" : self.entries}, index_file)
+        except OSError as e:
+            SlTrace.lg(f"PGN index {self.index_file_name} not saved: {e}")
+
+    def load(self):
+        """ Load saved index, if one
+        Anything not a well formed index is ignored, so the
+        index is rebuilt
+        :returns: True if loaded
+        """
+        if not os.path.exists(self.index_file_name):
+            return False
+
+        try:
+            with open(self.index_file_name, encoding="utf-8") as index_file:
+                saved = json.load(index_file)
+            if saved["version"] != self.FILE_VERSION:
+                return False
+
+            file_size = saved["file_size"]
+            file_mtime = saved["file_mtime"]
+            last_crc = saved["last_crc"]
+            entries = [(offset, length, tags)
+                       for offset, length, tags in saved["entries"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            SlTrace.lg(f"PGN index {self.index_file_name} ignored: {e}")
+            return False
+
+        if (not self.is_int(file_size) or not self.is_int(file_mtime)
+                or not (last_crc is None or self.is_int(last_crc))
+                or not all(self.is_int(offset) and self.is_int(length)
+                           and isinstance(tags, dict)
+                           and all(isinstance(tag, str)
+                                   and isinstance(value, str)
+                                   for tag, value in tags.items())
+                           for offset, length, tags in entries)):
+            SlTrace.lg(f"PGN index {self.index_file_name} ignored: bad form")
+            return False
+
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.last_crc = last_crc
+        self.entries = entries
+        return True
+
+    @staticmethod
+    def is_int(value):
+        """ True if value is an int (not bool)
+        """
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def read_game_text(self, game_index, game_file=None):
+        """ Read game's text
+        :game_index: game index, from 0
+        :game_file: open binary file default: open file_name
+        :returns: game's text, as read in text mode
+        """
+        offset, length, _ = self.entries[game_index]
+        if game_file is None:
+            with open(self.file_name, "rb") as game_file:
+                return self.read_game_text(game_index, game_file)
+
+        return read_game_text(game_file, offset, length)
+
+    def get_game(self, game_index):
+        """ Get game
+        :game_index: game index, from 0
+        :returns: PGNGame, moves parsed on first use
+        """
+        return pgn.loads(self.read_game_text(game_index), lazy=True)[0]
+
+    def iter_games(self, start_i=0, end_no=None):
+        """ Iterate over games, seeking to the first
+        :start_i: index of first game default: first
+        :end_no: number (from 1) of last game default: last
+        :returns: next game (PGNGame), moves parsed on first use
+        """
+        if end_no is None or end_no > len(self.entries):
+            end_no = len(self.entries)
+        with open(self.file_name, "rb") as game_file:
+            for game_index in range(start_i, end_no):
+                text = self.read_game_text(game_index, game_file)
+                yield from pgn.loads(text, lazy=True)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    SlTrace.clearFlags()
+    games_dir = sys.argv[1] if len(sys.argv) > 1 else "../games"
+    ngame = 0
+    time_start = time.time()
+    for name in sorted(os.listdir(games_dir)):
+        if name.endswith(".pgn"):
+            index = PgnIndex(os.path.join(games_dir, name))
+            index.scan()        # Build only, index files untouched
+            ngame += len(index)
+    SlTrace.lg(f"{games_dir}: {ngame} games indexed"
+               f" {time.time()-time_start:.3f} sec")
+    game_index = len(index)//2
+    time_start = time.time()
+    game = index.get_game(game_index)
+    SlTrace.lg(f"{name} game {game_index+1}: {game}"
+               f" {time.time()-time_start:.4f} sec")
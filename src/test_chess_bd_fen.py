@@ -3,28 +3,55 @@
 string parsing and production
 """
 import os
+import argparse
 from select_trace import SlTrace
 
 import chessboard as chb
 
-SlTrace.lg("Standard Initial Board Setup")
-cb = chb.Chessboard()   # Standard startup 
-cb_str = cb.board_to_fen_str()
-SlTrace.lg(cb_str)
-if (err:=cb.fen_setup(cb_str)):
-    SlTrace.lg(f"Error: {err}")
-cb_str2 = cb.board_to_fen_str()
-SlTrace.lg(cb_str2)
-if cb_str2 != cb_str:
-    SlTrace.lg("Error: NO Match")
+def check_engine(engine):
+    """ Check FEN round trip on an engine's board
+    :engine: board engine e.g. mailbox, dict, bitboard
+    :returns: number of errors
+    """
+    SlTrace.lg(f"engine: {engine}")
+    nerr = 0
 
-SlTrace.lg("Empty Board Setup")
-cb = chb.Chessboard(standard_setup=False)   # Empty board
-cb_str = cb.board_to_fen_str()
-SlTrace.lg(cb_str)
-if (err:=cb.fen_setup(cb_str)):
-    SlTrace.lg(f"Error: {err}")
-cb_str2 = cb.board_to_fen_str()
-SlTrace.lg(cb_str2)
-if cb_str2 != cb_str:
-    SlTrace.lg("Error: NO Match")
+    SlTrace.lg("Standard Initial Board Setup")
+    cb = chb.Chessboard(engine=engine)   # Standard startup 
+    cb_str = cb.board_to_fen_str()
+    SlTrace.lg(cb_str)
+    if (err:=cb.fen_setup(cb_str)):
+        nerr += 1
+        SlTrace.lg(f"Error: {err}")
+    cb_str2 = cb.board_to_fen_str()
+    SlTrace.lg(cb_str2)
+    if cb_str2 != cb_str:
+        nerr += 1
+        SlTrace.lg("Error: NO Match")
+
+    SlTrace.lg("Empty Board Setup")
+    cb = chb.Chessboard(standard_setup=False, engine=engine)   # Empty board
+    cb_str = cb.board_to_fen_str()
+    SlTrace.lg(cb_str)
+    if (err:=cb.fen_setup(cb_str)):
+        nerr += 1
+        SlTrace.lg(f"Error: {err}")
+    cb_str2 = cb.board_to_fen_str()
+    SlTrace.lg(cb_str2)
+    if cb_str2 != cb_str:
+        nerr += 1
+        SlTrace.lg("Error: NO Match")
+    return nerr
+
+def test_fen():
+    for engine in chb.Chessboard.ENGINES:
+        assert check_engine(engine) == 0, f"engine: {engine}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('engine', nargs='?', default="mailbox",
+                        help=f"Board engine: {', '.join(chb.Chessboard.ENGINES)}"
+                             " (default:mailbox)")
+    args = parser.parse_args()             # or die "Illegal options"
+    check_engine(args.engine)
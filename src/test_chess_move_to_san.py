@@ -0,0 +1,104 @@
+#test_chess_move_to_san.py 18Oct2026  crs, Author
+""" Test and time SAN generation (chess_move_to_san) by round trip
+over the PGN games:
+    game moves  -> replay_game -> moves made (UCI)
+                -> moves_to_san -> SAN
+                -> replay_game -> moves made, must be the same
+Also counts generated SAN differing in text from the game's own
+(e.g. a game writing Nbd7 where N7 is not needed, or leaving off +).
+Only moves_to_san is timed.
+
+Usage: python test_chess_move_to_san.py [-g games_dir] [-n max_games]
+                                        [-e engine]
+"""
+import os
+import re
+import time
+import argparse
+
+from graphics_braille.select_trace import SlTrace
+
+import pgn
+from chessboard import Chessboard
+
+def game_round_trip(game, engine):
+    """ Round trip one game
+    :game: PGNGame
+    :engine: board engine
+    :returns: (moves made (UCI), generated SAN, seconds generating,
+                error msg or None)
+    """
+    cb = Chessboard(engine=engine)
+    parsed = cb.replay_game(game.moves, ucis=True)
+    cb = Chessboard(engine=engine)
+    time_start = time.time()
+    sans = cb.moves_to_san(parsed.ucis)
+    dur = time.time() - time_start
+    if len(sans) != len(parsed.ucis):
+        return parsed.ucis, sans, dur, (f"move {len(sans)+1}:"
+                f" {parsed.ucis[len(sans)]} not converted")
+
+    regen = cb.replay_game(sans, ucis=True)
+    if regen.ucis != parsed.ucis:
+        return parsed.ucis, sans, dur, (f"regenerated moves differ:"
+                f" {regen.err if regen.err is not None else regen.ucis}")
+
+    return parsed.ucis, sans, dur, None
+
+def spec_text(spec):
+    """ Move spec as SAN would write it: no annotation or result
+    """
+    spec = re.sub(r'\s*([0-1]-[0-1]|1/2-1/2|\*)\s*$', '', spec)
+    return re.sub(r'[!?]+$', '', spec.strip())
+
+
+if __name__ == "__main__":
+    games_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "games")
+    max_games = 100
+    engine = "mailbox"
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-g', '--games_dir', default=games_dir,
+                        help=f"PGN games directory (default:{games_dir})")
+    parser.add_argument('-n', '--max_games', type=int, default=max_games,
+                        help=f"Games per file, 0 - all (default:{max_games})")
+    parser.add_argument('-e', '--engine', default=engine,
+                        help=f"Board engine (default:{engine})")
+    args = parser.parse_args()             # or die "Illegal options"
+
+    SlTrace.clearFlags()
+    ngame = nmove = ntext_diff = nfail = 0
+    gen_time = 0
+    for name in sorted(os.listdir(args.games_dir)):
+        if not name.endswith(".pgn"):
+            continue
+        with open(os.path.join(args.games_dir, name)) as game_file:
+            games = pgn.loads(game_file.read())
+        if args.max_games > 0:
+            games = games[:args.max_games]
+        for game in games:
+            ucis, sans, dur, err = game_round_trip(game, args.engine)
+            ngame += 1
+            nmove += len(sans)
+            gen_time += dur
+            if err is not None:
+                nfail += 1
+                SlTrace.lg(f"FAIL {name} {game}: {err}")
+                continue
+
+            specs = [spec_text(spec) for spec in game.moves
+                     if not spec.startswith("{")]
+            for spec, san in zip(specs, sans):
+                if spec != san:
+                    ntext_diff += 1
+                    if ntext_diff <= 10:
+                        SlTrace.lg(f"    {name} {game}: game: {spec}"
+                                   f" generated: {san}")
+    SlTrace.lg(f"{ngame} games {nmove} moves generated {gen_time:.3f} sec"
+               f" {nmove/gen_time if gen_time > 0 else 0:.0f} moves/sec")
+    SlTrace.lg(f"{ntext_diff} moves written differently by the game")
+    if nfail > 0:
+        SlTrace.lg(f"{nfail} games FAILED round trip")
+    else:
+        SlTrace.lg("NO FAILS")
@@ -0,0 +1,131 @@
+#test_pgn_index.py 18Oct2026  crs, Author
+""" Test PGN file offset index (PgnIndex) against pgn.loads,
+on copies of the games in a temporary directory:
+    index splits the games as loads: count, tags, moves
+    games appended: only the new games are indexed
+    file shrunk or changed: index is rebuilt
+
+Usage: python test_pgn_index.py [games_dir]
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+from graphics_braille.select_trace import SlTrace
+
+import pgn
+from pgn_index import PgnIndex, decode_text
+
+nfail = 0
+
+def fail(msg):
+    """ Report failure
+    """
+    global nfail
+    nfail += 1
+    SlTrace.lg(f"Error: {msg}")
+
+def game_value(game):
+    """ Game's tags and moves, for comparing
+    """
+    return ({key: value for key, value in vars(game).items()
+             if not key.startswith("_")}, game.moves)
+
+def load_games(file_name):
+    """ Parse whole file, as text mode would read it
+    """
+    with open(file_name, "rb") as game_file:
+        text = decode_text(game_file.read()).replace("\r\n", "\n")
+    return pgn.loads(text)
+
+def check_index(file_name, desc):
+    """ Check file's saved index splits games as pgn.loads
+    :file_name: PGN file
+    :desc: check description
+    :returns: index (PgnIndex)
+    """
+    index = PgnIndex.get_index(file_name)
+    games = load_games(file_name)
+    name = os.path.basename(file_name)
+    if len(index) != len(games):
+        fail(f"{name} {desc}: {len(index)} games indexed"
+             f" loads: {len(games)}")
+        return index
+
+    for game_index, (game, indexed) in enumerate(zip(games,
+                                                index.iter_games())):
+        tags = index.get_tags(game_index)
+        if any(getattr(game, tag) != value for tag, value in tags.items()):
+            fail(f"{name} {desc} game {game_index+1}: tags {tags}"
+                 f" loads: {game}")
+            break
+        if game_value(indexed) != game_value(game):
+            fail(f"{name} {desc} game {game_index+1}: {indexed}"
+                 f" differs from loads: {game}")
+            break
+    return index
+
+
+if __name__ == "__main__":
+    games_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)),
+                    "..", "games")
+    SlTrace.clearFlags()
+    test_dir = tempfile.mkdtemp(prefix="test_pgn_index")
+    try:
+        file_names = []
+        for name in sorted(os.listdir(games_dir)):
+            if name.endswith(".pgn"):
+                file_names.append(shutil.copy(os.path.join(games_dir, name),
+                                              test_dir))
+        SlTrace.lg(f"Index {len(file_names)} files")
+        for file_name in file_names:
+            index = check_index(file_name, "built")
+            SlTrace.lg(f"    {os.path.basename(file_name)}:"
+                       f" {len(index)} games")
+            if PgnIndex.get_index(file_name).update() != 0:
+                fail(f"{os.path.basename(file_name)}: saved index not reused")
+
+        file_name, extra_name = file_names[0], file_names[-1]
+        with open(extra_name, "rb") as extra_file:
+            extra = extra_file.read()
+        nextra = len(PgnIndex.get_index(extra_name))
+
+        SlTrace.lg("Games appended")
+        index = PgnIndex.get_index(file_name)
+        nbefore = len(index)
+        with open(file_name, "ab") as game_file:
+            game_file.write(b"\n" + extra)
+        nindexed = index.update()
+        if nindexed != nextra + 1:          # new games, last redone
+            fail(f"append: {nindexed} games indexed,"
+                 f" expected {nextra + 1}")
+        index = check_index(file_name, "appended")
+        if len(index) != nbefore + nextra:
+            fail(f"append: {len(index)} games, expected {nbefore + nextra}")
+
+        SlTrace.lg("File shrunk")
+        shutil.copy(extra_name, file_name)
+        index = check_index(file_name, "shrunk")
+        if len(index) != nextra:
+            fail(f"shrunk: {len(index)} games, expected {nextra}")
+
+        SlTrace.lg("File changed, grown")
+        with open(file_names[1], "rb") as other_file:
+            other = other_file.read()
+        nother = len(PgnIndex.get_index(file_names[1]))
+        with open(file_name, "wb") as game_file:
+            game_file.write(other + b"\n" + extra)
+        nindexed = index.update()
+        if nindexed != nother + nextra:     # all games, rebuilt
+            fail(f"changed: {nindexed} games indexed,"
+                 f" expected {nother + nextra}")
+        check_index(file_name, "changed")
+    finally:
+        shutil.rmtree(test_dir)
+
+    if nfail > 0:
+        SlTrace.lg(f"{nfail} FAILS")
+    else:
+        SlTrace.lg("NO FAILS")
@@ -46,6 +46,9 @@ from chessboard import Chessboard
 from chessboard_stack import ChessboardStack
 from chess_move import ChessMove
 from chess_move_notation import ChessMoveNotation
+from chess_game_timeline import ChessGameTimeline
+from chess_timeline_worker import ChessTimelineWorker
+from chess_san_cache import ChessSanCache
 from wx_chess_game_display import ChessGameDisplay
 from chessboard_print import ChessboardPrint
 
@@ -74,6 +77,8 @@ class ChessCentralShow:
         # Support board/display access
         self.cbs = None
         self.cbd = None
+        self.timeline = None            # Current game's positions
+        self.timeline_worker = None     # Building timeline, if any
         self.do_looping_count = 0       # looping coung
 
     def setup_display(self, game):
@@ -107,16 +112,109 @@ class ChessCentralShow:
         self.display_board()
         
         
-    def setup_board(self, game):
+    def setup_board(self, game, use_timeline=True):
         """ Setup new game board
         :game: game in pgn 
+        :use_timeline: True - replay the whole game
+                    (ChessGameTimeline) into the board stack,
+                    on a worker thread, so goto any move is a lookup
+                False - moves are made as played e.g. scanning
+                default: True
         """
         
         self.cbd.sel_game = game
         self.current_game = game
         self.current_move_index = 0
+        self.cancel_timeline()
+        if use_timeline and game is not None:
+            self.start_timeline(game)
         ###self.cbd.restart()
         self.restart_game()
+
+    def start_timeline(self, game):
+        """ Start replaying game on a worker thread
+        Positions are added to the board stack as they
+        are ready, the display can be used meanwhile.
+        :game: PGN game
+        """
+        timeline = ChessGameTimeline(game=game)
+        self.cbs.load_timeline(timeline)    # Starting position
+        self.timeline = timeline
+        self.timeline_worker = ChessTimelineWorker(
+                                timeline,
+                                on_progress=self.timeline_progress,
+                                on_error=self.timeline_error,
+                                on_done=self.timeline_done,
+                                call_after=wx.CallAfter)
+        self.timeline_worker.start()
+
+    def cancel_timeline(self):
+        """ Stop current game's timeline replay, if any
+        """
+        if self.timeline_worker is not None:
+            self.timeline_worker.cancel()
+            self.timeline_worker = None
+        self.timeline = None
+
+    def timeline_progress(self, worker, count):
+        """ Timeline positions ready - on display thread
+        :worker: ChessTimelineWorker
+        :count: positions 0..count-1 ready
+        """
+        if worker is not self.timeline_worker:
+            return      # Old game's
+        
+        nadded = self.cbs.extend_timeline(worker.timeline, count)
+        if nadded is None:
+            SlTrace.lg("Board stack has left the game's moves"
+                       " - game replay dropped")
+            self.cancel_timeline()
+            return
+        
+        if count-1 > self.current_move_index:
+            self.current_move_index = count-1   # Next to make as played
+        self.cbd.set_timeline_progress(count, len(worker.timeline.specs)+1)
+
+    def timeline_error(self, worker, index, err):
+        """ Game replay hit a bad move - on display thread
+        :worker: ChessTimelineWorker
+        :index: move spec index
+        :err: error message
+        """
+        if worker is not self.timeline_worker:
+            return
+        
+        msg = f"Game replay stopped at move {index+1}: {err}"
+        SlTrace.lg(msg)
+        self.cbd.err_add(msg)
+
+    def timeline_done(self, worker):
+        """ Game replay finished - on display thread
+        :worker: ChessTimelineWorker
+        """
+        if worker is not self.timeline_worker:
+            return
+        
+        self.timeline_worker = None
+        timeline = worker.timeline
+        if (len(self.cbs) == len(timeline)
+                and timeline.spec_index > self.current_move_index):
+            self.current_move_index = timeline.spec_index
+        self.cbd.set_timeline_progress(len(timeline), len(timeline))
+
+    def load_timeline(self, timeline):
+        """ Load game positions into the board stack
+        Moves after the timeline's end (result, decode error)
+        are still made as played
+        :timeline: ChessGameTimeline, already built
+        """
+        self.cancel_timeline()
+        self.timeline = timeline
+        self.cbs.load_timeline(timeline)
+        self.current_move_index = timeline.spec_index
+        if timeline.err is not None:
+            SlTrace.lg(f"Game replay stopped at move"
+                       f" {timeline.err_index+1}: {timeline.err}")
         
     def get_move_desc(self):
         """ Get move descriptor / title
@@ -232,9 +330,10 @@ class ChessCentralShow:
                 SlTrace.lg(f"spec error:{cm.err}")
                 self.error_show(desc=f"{err_prefix} {decode_ret = } spec error:{cm.err}")
                 return None
-            
+            is_made = False
         else:
-            cm = cm_or_spec
+            cm = cm_or_spec     # redo - board stack has the move made
+            is_made = True
         if cm is not None and cm.game_result is not None:
             self.cbd.set_end_game()
             self.display_board(move_type=self.cbd.END_GAME)
@@ -250,7 +349,8 @@ class ChessCentralShow:
                 self.cbd.stop_looping()
             '''
             SlTrace.lg("Ready to make move")
-        cm.make_move()
+        if not is_made:
+            cm.make_move()
         self.display_board()
         return cm
                 
@@ -394,7 +494,7 @@ class ChessCentralShow:
         
         #setup_display()
         self.game_desc = f"{self.cbd.sel_short_desc} {self.cbd.scan_file_name}"
-        self.setup_board(game)
+        self.setup_board(game, use_timeline=False)
         self.display_board()
 
     def game_to_desc(self, game):
@@ -429,10 +529,11 @@ class ChessCentralShow:
         self.setup_board(game)
         return None
 
-    def cgd_goto_move(self, move_no, moved="white"):
+    def cgd_goto_move(self, move_no, moved="white", display=True):
         """ Go to move (after) and set display
         :move_no: table index, 0 - game beginning, before white's first move
         :moved: "-","white","black" last moved default: "white"
+        :display: True - display board default: True
         """
         SlTrace.lg(f"ccs: cmd_goto_move({move_no =}, {moved=})")
         if move_no < 1:
@@ -442,18 +543,26 @@ class ChessCentralShow:
             if moved == "black":
                 move_index += 1
         SlTrace.lg(f"cmd_goto_move: {move_no=}, {moved=}, {move_index=}")
-        return self.cgd_goto_move_index(move_index)
+        return self.cgd_goto_move_index(move_index, display=display)
         
-    def cgd_goto_move_index(self, move_index):    
-        if move_index < 0 or move_index > len(self.cbs.board_stack)-1:
+    def cgd_goto_move_index(self, move_index, display=True):
+        """ Go to board stack position
+        With the game's timeline loaded (load_timeline) every
+        position is already in the stack, so this is a lookup
+        :move_index: stack index, negative from end
+        :display: True - display board default: True
+        :returns: move_index, -1 if out of range
+        """
+        if move_index < 0 or move_index > len(self.cbs)-1:
             while self.do_move() is not None:
                 pass
 
         if move_index < 0:
-            move_index = len(self.cbs.board_stack)+move_index
-        if move_index >= 0 and move_index < len(self.cbs.board_stack):
+            move_index = len(self.cbs)+move_index
+        if move_index >= 0 and move_index < len(self.cbs):
             self.cbs.set_cur_bd_index(move_index)
-            self.display_board()
+            if display:
+                self.display_board()
             return move_index
         
         return -1
@@ -512,10 +621,10 @@ class ChessCentralShow:
         self.stop_loop()
         # If move_index is out of range, do moves to get there,
         # bringing in moves from current game, if any
-        if move_index < 0 or move_index > len(self.cbs.board_stack)-1:
+        if move_index < 0 or move_index > len(self.cbs)-1:
             while self.do_move() is not None:
                 pass
-        stack_len = len(self.cbs.board_stack)        
+        stack_len = len(self.cbs)        
         if move_index >= 0 and move_index < stack_len:
             self.cbs.set_cur_bd_index(move_index)
         else:
@@ -535,13 +644,13 @@ class ChessCentralShow:
             if moved == "black":
                 move_index += 1
         self.stop_loop()
-        if move_index < 0 or move_index > len(self.cbs.board_stack)-1:
+        if move_index < 0 or move_index > len(self.cbs)-1:
             while self.do_move() is not None:
                 pass
 
         if move_index < 0:
-            move_index = len(self.cbs.board_stack)+move_index
-        if move_index >= 0 and move_index < len(self.cbs.board_stack):
+            move_index = len(self.cbs)+move_index
+        if move_index >= 0 and move_index < len(self.cbs):
             self.cbs.set_cur_bd_index(move_index)
             self.display_board()
             
@@ -617,14 +726,16 @@ class ChessCentralShow:
         """ Do chess goto_move updating state and returning new move_index, 
             -1 if failed
         """
-        new_move_index = self.cgd_chess_goto_move(move_no, moved=moved)
+        new_move_index = self.cgd_goto_move(move_no, moved=moved,
+                                            display=False)
         return new_move_index
 
     def update_board_state_for_goto_move_index(self, move_index):
         """ Do chess goto_move updating state and returning new move_index, 
             -1 if failed
         """
-        new_move_index = self.cgd_goto_move_index(move_index)
+        new_move_index = self.cgd_goto_move_index(move_index,
+                                                  display=False)
         return new_move_index
     
 
@@ -678,6 +789,7 @@ if __name__ == '__main__':
     quit_on_fail = True         # Quit on first fail    
     scan_max_loops = 1          # Limit scanning loops
     update_as_loaded = False
+    san_cache_file = None
     width = int(80*8+80*1.3)
     height = int(80*8+80*2.5)
     frame = wx.Frame(None, size=wx.Size(width,height)) 
@@ -701,11 +813,20 @@ if __name__ == '__main__':
     parser.add_argument('-q', '--quit_on_fail', action='store_true', default=quit_on_fail,
                         help=(f"Quit on first failure"
                                 f" (default: {quit_on_fail}"))
+    parser.add_argument('--san_cache', default=san_cache_file,
+                        help=("Resolved move cache file, loaded at start"
+                              " and saved at exit"
+                                " (default: not kept between runs)"))
 
     args = parser.parse_args()             # or die "Illegal options"
 
     file = args.file
     quit_on_fail = args.quit_on_fail
+    san_cache_file = args.san_cache
+    san_cache = ChessSanCache.get_default()
+    if san_cache_file is not None:
+        SlTrace.lg(f"{san_cache.load(san_cache_file)} resolved moves"
+                   f" from {san_cache_file}")
 
 
 
@@ -715,3 +836,7 @@ if __name__ == '__main__':
     SlTrace.set_start_time()     
     ccs.cbd.update()            
     ccs.cbd.mainloop()     
+    if san_cache_file is not None:
+        SlTrace.lg(san_cache.stats_str())
+        SlTrace.lg(f"{san_cache.save(san_cache_file)} resolved moves"
+                   f" to {san_cache_file}")
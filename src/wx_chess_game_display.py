@@ -17,6 +17,7 @@ import time
 import wx
 
 import pgn
+from pgn_index import PgnIndex
 
 from gr_input import gr_input        
 from graphics_braille.wx_speaker_control import SpeakerControlLocal
@@ -140,6 +141,7 @@ class ChessGameDisplay(wx.Frame):
         self.scan_ngame_total = 0   # total games scanned
         self.sel_short_desc = None
         self.sel_game = None
+        self.game_data_source = None    # File open game list
         self.setting_game_start_no = 1
         self.setting_game_end_no = None # No limit
         self.setting_is_move_display = True
@@ -424,8 +426,12 @@ class ChessGameDisplay(wx.Frame):
     """
     def do_game_file(self, selection=None):
         """ process selection
-        :selection: (index,...,game)
+        :selection: (index,...,game index) from game_data_source
+            passed on as (index,...,game), the game read now
         """
+        if selection is not None:
+            game = self.game_data_source.GetGame(selection[-1])
+            selection = selection[:-1] + (game,)
         self.ccs.cgd_game_file(selection=selection)
         
     def cmd_file_open(self, e=None):
@@ -441,8 +447,9 @@ class ChessGameDisplay(wx.Frame):
 
             # Proceed loading the file chosen by the user
             game_file_name = fileDialog.GetPath()
-            game_data_source = ChessGameDataSource(game_file_name)
-            game_select = SelectionOK(self, game_data_source, doOK=self.do_game_file)
+            self.game_data_source = ChessGameDataSource(game_file_name)
+            game_select = SelectionOK(self, self.game_data_source,
+                                      doOK=self.do_game_file)
             game_select.Show()
             
     def cmd_file_save(self, e=None):
@@ -892,7 +899,7 @@ class ChessGameDisplay(wx.Frame):
             move_idx = (move_no-1)*2+1
             if moved == "black":
                 move_idx += 1
-        stack_len = len(self.cbs.board_stack)        
+        stack_len = len(self.cbs)        
         if move_idx >= 0 and move_idx < stack_len:
             self.cbs.set_cur_bd_index(move_idx)
             self.display_board()
@@ -948,7 +955,18 @@ class ChessGameDisplay(wx.Frame):
             text = self.get_move_desc()
         self.txt_games_history.SetLabel(text)
         self.txt_games_history.Refresh()
-        
+
+    def set_timeline_progress(self, count, total):
+        """ Show game replay progress, in the move description
+        place, till replay is done
+        :count: positions ready
+        :total: positions expected
+        """
+        if count >= total:
+            self.set_move_desc()
+        else:
+            self.set_move_desc(f"Loading moves {count}/{total}")
+
 
     def set_title(self, title):
         """ Set game frame title
@@ -1502,25 +1520,30 @@ class ChessGameDisplay(wx.Frame):
                 self.scan_nfile += 1
                 SlTrace.lg(f"\nFile {self.scan_nfile:2}: {file}")
                 self.scan_file_name = file
-                with open(file) as game_file:
-                    pgn_text = game_file.read()
-                    pgn_games = pgn.loads(pgn_text) # Returns a list of PGNGame
-                    start_i = 0
-                    end_i = len(pgn_games)-1
-                    if (self.setting_game_start_no > 1
-                        and self.setting_game_start_no < len(pgn_games)):
-                        start_i = self.setting_game_start_no-1
-                    if (self.setting_game_end_no is not None and
-                        self.setting_game_end_no != ""):     
-                       if (self.setting_game_end_no >= 0
-                           and self.setting_game_end_no < len(pgn_games)):
-                           end_i = self.setting_game_end_no-1
-                           pgn_games = pgn_games[self.setting_game_start_no-1:] 
-                    self.scan_ngame = start_i   # Bump before descr
-                    self.scan_games_iter = iter(pgn_games[start_i:end_i+1])
+                start_i = 0
+                if self.setting_game_start_no > 1:
+                    start_i = self.setting_game_start_no-1
+                end_no = None
+                if (self.setting_game_end_no is not None and
+                    self.setting_game_end_no != ""):
+                    if self.setting_game_end_no >= 0:
+                        end_no = self.setting_game_end_no
+                self.scan_ngame = start_i   # Bump before descr
+                self.scan_games_iter = self.scan_file_games(file,
+                                            start_i, end_no)
             else:
                 return game
  
+    def scan_file_games(self, file, start_i=0, end_no=None):
+        """ Iterate over a file's games, reading one game at a time
+        :file: PGN file path
+        :start_i: index of first game default: first
+        :end_no: number (from 1) of last game default: last
+        :returns: next game (PGNGame)
+        """
+        # Index seeks straight to first game, decodes as the game list
+        yield from PgnIndex.get_index(file).iter_games(start_i, end_no)
+
     def scan_get_file(self):
         """ Get next file, None if no more
         :returns: file_path, else None if nomore files
@@ -494,13 +494,13 @@ def goto_move_cmd(move_no, moved="white"):
             move_idx += 1
     SlTrace.lg(f"goto_move_cmd: {move_no=}, {moved=}, {move_idx=}")    
     stop_loop()
-    if move_idx < 0 or move_idx > len(cbs.board_stack)-1:
+    if move_idx < 0 or move_idx > len(cbs)-1:
         while do_move() is not None:
             pass
 
     if move_idx < 0:
-        move_idx = len(cbs.board_stack)+move_idx
-    if move_idx >= 0 and move_idx < len(cbs.board_stack):
+        move_idx = len(cbs)+move_idx
+    if move_idx >= 0 and move_idx < len(cbs):
         cbs.set_cur_bd_index(move_idx)
         display_board()
 
@@ -558,10 +558,10 @@ def set_move_no(move_no, moved="white"):
     stop_loop()
     # If move_idx is out of range, do moves to get there,
     # bringing in moves from current game, if any
-    if move_idx < 0 or move_idx > len(cbs.board_stack)-1:
+    if move_idx < 0 or move_idx > len(cbs)-1:
         while do_move() is not None:
             pass
-    stack_len = len(cbs.board_stack)        
+    stack_len = len(cbs)        
     if move_idx >= 0 and move_idx < stack_len:
         cbs.set_cur_bd_index(move_idx)
     else:
@@ -581,13 +581,13 @@ def set_move_no_x(move_no, moved="white"):
         if moved == "black":
             move_idx += 1
     stop_loop()
-    if move_idx < 0 or move_idx > len(cbs.board_stack)-1:
+    if move_idx < 0 or move_idx > len(cbs)-1:
         while do_move() is not None:
             pass
 
     if move_idx < 0:
-        move_idx = len(cbs.board_stack)+move_idx
-    if move_idx >= 0 and move_idx < len(cbs.board_stack):
+        move_idx = len(cbs)+move_idx
+    if move_idx >= 0 and move_idx < len(cbs):
         cbs.set_cur_bd_index(move_idx)
         display_board() 
                     